@@ -0,0 +1,22 @@
+"""
+Optional Numba support for numeric kernels
+
+`njit` compiles the decorated function with Numba when it is installed and
+returns it unchanged otherwise, so kernels always remain importable and
+behave identically as plain Python.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
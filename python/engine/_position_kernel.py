@@ -0,0 +1,61 @@
+from ._jit import njit
+
+
+@njit(cache=True)
+def apply_trade_kernel(quantity, average_entry_price, realized_pnl, trade_quantity, trade_price):
+    """
+    Apply a signed fill to the numeric state of a position
+    
+    Args:
+        quantity: Current position quantity (negative when short)
+        average_entry_price: Current average entry price
+        realized_pnl: Realized P&L accumulated so far
+        trade_quantity: Fill quantity, positive for buys and negative for sells
+        trade_price: Fill price
+    
+    Returns:
+        (quantity, average_entry_price, realized_pnl, unrealized_pnl) after the fill
+    """
+    old_quantity = quantity
+    old_cost_basis = abs(old_quantity) * average_entry_price if old_quantity != 0 else 0.0
+    new_quantity = old_quantity + trade_quantity
+    
+    # Update realized P&L if crossing zero or reducing position
+    if (old_quantity > 0 and trade_quantity < 0) or (old_quantity < 0 and trade_quantity > 0):
+        if abs(trade_quantity) <= abs(old_quantity):
+            # Partial or full closure
+            closing_quantity = abs(trade_quantity)
+            if old_quantity > 0:  # Long position being reduced
+                realized_pnl += closing_quantity * (trade_price - average_entry_price)
+            else:  # Short position being reduced
+                realized_pnl += closing_quantity * (average_entry_price - trade_price)
+        else:
+            # Position crosses zero (flips): realize P&L on the entire old position
+            if old_quantity > 0:  # Long to short
+                realized_pnl += old_quantity * (trade_price - average_entry_price)
+            else:  # Short to long
+                realized_pnl += abs(old_quantity) * (average_entry_price - trade_price)
+            
+            # Remaining quantity becomes the new position, entered at the fill price
+            new_quantity = abs(trade_quantity) - abs(old_quantity)
+            if trade_quantity < 0:
+                new_quantity = -new_quantity
+            # Nothing is unrealized yet since the new position is marked at its entry
+            return new_quantity, trade_price, realized_pnl, 0.0
+    
+    # Update average entry price if increasing position
+    if new_quantity != 0:
+        # Only fills from zero or in the same direction change the entry price;
+        # reductions close at the existing average
+        if old_quantity == 0 or (old_quantity > 0 and trade_quantity > 0) or (old_quantity < 0 and trade_quantity < 0):
+            new_cost_basis = old_cost_basis + abs(trade_quantity) * trade_price
+            average_entry_price = new_cost_basis / abs(new_quantity)
+    else:
+        # Position closed exactly
+        average_entry_price = 0.0
+    
+    # Signed quantity gives the right sign for both sides (and zero when flat)
+    unrealized_pnl = new_quantity * (trade_price - average_entry_price)
+    
+    return new_quantity, average_entry_price, realized_pnl, unrealized_pnl
+
@@ -0,0 +1,30 @@
+from ._jit import njit, NUMBA_AVAILABLE
+
+
+@njit(cache=True)
+def drawdown_kernel(peak, current, max_pct):
+    """
+    Update the running peak and measure drawdown from it
+    
+    Args:
+        peak: Highest portfolio value seen so far
+        current: Current portfolio value
+        max_pct: Drawdown limit in percent
+    
+    Returns:
+        (peak, drawdown_pct, breached) after including the current value;
+        drawdown is 0 and never breached while the peak is not positive,
+        and a NaN drawdown is always breached
+    """
+    # A NaN peak (from a NaN first mark) is replaced rather than kept forever
+    new_peak = current if current > peak or peak != peak else peak
+    if new_peak <= 0:
+        return new_peak, 0.0, False
+    drawdown_pct = (new_peak - current) / abs(new_peak) * 100.0
+    # Written so that a NaN drawdown (e.g. from a NaN mark) counts as a breach
+    return new_peak, drawdown_pct, not drawdown_pct <= max_pct
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from cache) at import rather than on the first risk check
+    drawdown_kernel(1.0, 1.0, 1.0)
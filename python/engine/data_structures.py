@@ -1,10 +1,77 @@
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, List, Optional, Union, Any
-from datetime import datetime
-import uuid
+from typing import Dict, List, Optional, Tuple, Union, Any
+from datetime import datetime, timedelta, timezone
+import itertools
+import json
+import sys
+import time
 import numpy as np
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ._position_kernel import apply_trade_kernel
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def ns_to_datetime(timestamp_ns: int) -> datetime:
+    """Convert nanoseconds since the epoch to a naive UTC datetime"""
+    return _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+
+
+def datetime_to_ns(dt: datetime) -> int:
+    """Convert a datetime (naive UTC or timezone-aware) to nanoseconds since the epoch"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return (dt - _EPOCH) // timedelta(microseconds=1) * 1000
+
+
+# Monotonic 63-bit ids: boot time in microseconds shifted left leaves room for
+# 4096 ids per microsecond of uptime before a restarted process could collide
+_ID_COUNTER = itertools.count(time.time_ns() // 1000 << 12)
+
+
+def _next_id() -> str:
+    """Generate a unique internal order/trade id (hex-formatted 63-bit counter)"""
+    return format(next(_ID_COUNTER), 'x')
+
+
+def _encode(obj: Any) -> Any:
+    """Fallback encoder for values the JSON serializer doesn't handle natively"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_json(obj: Any) -> bytes:
+    """
+    Serialize an object (or a dict/list containing engine objects) to JSON bytes
+    
+    Uses orjson when it is installed and falls back to the standard library
+    json module otherwise. Engine objects are encoded via their to_dict(), so
+    both paths produce the same document (orjson itself encodes bare enum
+    members by value; to_dict() output already carries enum names).
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            obj, default=_encode,
+            option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, default=_encode).encode()
+
 
 class MarketDataType(Enum):
     QUOTE = auto()
@@ -48,23 +115,69 @@ class TimeInForce(Enum):
     GTD = auto()  # Good Till Date
 
 
-@dataclass
+class EventType(Enum):
+    MARKET_DATA = auto()
+    ORDER_UPDATE = auto()
+    TRADE_UPDATE = auto()
+    POSITION_UPDATE = auto()
+    STRATEGY_SIGNAL = auto()
+    RISK_CHECK = auto()
+    SYSTEM_EVENT = auto()
+
+
+# Precomputed enum lookups for serialization, avoiding the `.name` descriptor
+# and the Enum[...] metaclass __getitem__ on every to_dict/from_dict call
+_ENUM_NAMES: Dict[Enum, str] = {
+    member: member.name
+    for member in itertools.chain(MarketDataType, OrderType, OrderSide, OrderStatus, TimeInForce, EventType)
+}
+_MARKET_DATA_TYPE_BY_NAME = MarketDataType._member_map_
+_ORDER_TYPE_BY_NAME = OrderType._member_map_
+_ORDER_SIDE_BY_NAME = OrderSide._member_map_
+_ORDER_STATUS_BY_NAME = OrderStatus._member_map_
+_TIME_IN_FORCE_BY_NAME = TimeInForce._member_map_
+
+_ACTIVE_STATUSES = frozenset({
+    OrderStatus.PENDING_NEW,
+    OrderStatus.NEW,
+    OrderStatus.PARTIALLY_FILLED
+})
+
+
+@dataclass(slots=True)
 class MarketData:
     instrument_id: str
-    timestamp: datetime
+    timestamp_ns: int
     data_type: MarketDataType
     exchange: str
     data: Dict[str, Any]
     source: str
     sequence_id: Optional[int] = None
+    
+    def __post_init__(self):
+        # Low-cardinality keys are interned so repeated values share one object
+        self.instrument_id = sys.intern(self.instrument_id)
+        self.exchange = sys.intern(self.exchange)
+        self.source = sys.intern(self.source)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.timestamp_ns = datetime_to_ns(value)
 
     def to_dict(self) -> Dict:
         return {
             "instrument_id": self.instrument_id,
             "timestamp": self.timestamp.isoformat(),
-            "data_type": self.data_type.name,
+            "data_type": _ENUM_NAMES[self.data_type],
             "exchange": self.exchange,
-            "data": self.data,
+            "data": {
+                key: value.tolist() if isinstance(value, np.ndarray) else value
+                for key, value in self.data.items()
+            },
             "source": self.source,
             "sequence_id": self.sequence_id
         }
@@ -73,8 +186,8 @@ class MarketData:
     def from_dict(cls, data_dict: Dict) -> 'MarketData':
         return cls(
             instrument_id=data_dict["instrument_id"],
-            timestamp=datetime.fromisoformat(data_dict["timestamp"]),
-            data_type=MarketDataType[data_dict["data_type"]],
+            timestamp_ns=datetime_to_ns(datetime.fromisoformat(data_dict["timestamp"])),
+            data_type=_MARKET_DATA_TYPE_BY_NAME[data_dict["data_type"]],
             exchange=data_dict["exchange"],
             data=data_dict["data"],
             source=data_dict["source"],
@@ -82,23 +195,102 @@ class MarketData:
         )
 
 
-@dataclass
+class _BookSideView:
+    """Read-only list-of-dict view over one side of an OrderBook"""
+    __slots__ = ("_prices", "_sizes")
+    
+    def __init__(self, prices: np.ndarray, sizes: np.ndarray):
+        self._prices = prices
+        self._sizes = sizes
+    
+    def __len__(self) -> int:
+        return len(self._prices)
+    
+    def __getitem__(self, index: int) -> Dict[str, float]:
+        return {"price": float(self._prices[index]), "size": float(self._sizes[index])}
+    
+    def __iter__(self):
+        for price, size in zip(self._prices.tolist(), self._sizes.tolist()):
+            yield {"price": price, "size": size}
+
+
+def _empty_levels() -> np.ndarray:
+    return np.empty(0, dtype=np.float64)
+
+
+@dataclass(slots=True)
 class OrderBook:
+    """
+    Order book snapshot stored column-wise (SoA)
+    
+    Each side is a pair of float64 arrays; bids are best (highest) first and
+    asks are best (lowest) first, so index 0 is the top of book. Price columns
+    must keep that ordering (from_levels enforces it) since lookups binary-search them.
+    """
     instrument_id: str
-    timestamp: datetime
+    timestamp_ns: int
     exchange: str
-    bids: List[Dict[str, float]] = field(default_factory=list)  # List of {price, size} dicts
-    asks: List[Dict[str, float]] = field(default_factory=list)  # List of {price, size} dicts
+    bid_px: np.ndarray = field(default_factory=_empty_levels)
+    bid_sz: np.ndarray = field(default_factory=_empty_levels)
+    ask_px: np.ndarray = field(default_factory=_empty_levels)
+    ask_sz: np.ndarray = field(default_factory=_empty_levels)
+    
+    def __post_init__(self):
+        self.instrument_id = sys.intern(self.instrument_id)
+        self.exchange = sys.intern(self.exchange)
+        self.bid_px = np.asarray(self.bid_px, dtype=np.float64)
+        self.bid_sz = np.asarray(self.bid_sz, dtype=np.float64)
+        self.ask_px = np.asarray(self.ask_px, dtype=np.float64)
+        self.ask_sz = np.asarray(self.ask_sz, dtype=np.float64)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+    
+    @classmethod
+    def from_levels(cls, instrument_id: str, timestamp_ns: int, exchange: str,
+                    bids: List[Dict[str, float]], asks: List[Dict[str, float]]) -> 'OrderBook':
+        """Build an order book from lists of {price, size} dicts, sorting each side if needed"""
+        bid_px = np.fromiter((b["price"] for b in bids), np.float64, len(bids))
+        bid_sz = np.fromiter((b["size"] for b in bids), np.float64, len(bids))
+        ask_px = np.fromiter((a["price"] for a in asks), np.float64, len(asks))
+        ask_sz = np.fromiter((a["size"] for a in asks), np.float64, len(asks))
+        
+        # Liquidity lookups binary-search the price columns, so enforce the ordering here
+        if bid_px.size > 1 and (bid_px[1:] > bid_px[:-1]).any():
+            order = np.argsort(-bid_px, kind="stable")
+            bid_px, bid_sz = bid_px[order], bid_sz[order]
+        if ask_px.size > 1 and (ask_px[1:] < ask_px[:-1]).any():
+            order = np.argsort(ask_px, kind="stable")
+            ask_px, ask_sz = ask_px[order], ask_sz[order]
+        
+        return cls(
+            instrument_id=instrument_id,
+            timestamp_ns=timestamp_ns,
+            exchange=exchange,
+            bid_px=bid_px,
+            bid_sz=bid_sz,
+            ask_px=ask_px,
+            ask_sz=ask_sz
+        )
+    
+    @property
+    def bids(self) -> _BookSideView:
+        return _BookSideView(self.bid_px, self.bid_sz)
+    
+    @property
+    def asks(self) -> _BookSideView:
+        return _BookSideView(self.ask_px, self.ask_sz)
     
     def mid_price(self) -> Optional[float]:
-        if not self.bids or not self.asks:
+        if not self.bid_px.size or not self.ask_px.size:
             return None
-        return (self.bids[0]["price"] + self.asks[0]["price"]) / 2
+        return 0.5 * float(self.bid_px[0] + self.ask_px[0])
     
     def spread(self) -> Optional[float]:
-        if not self.bids or not self.asks:
+        if not self.bid_px.size or not self.ask_px.size:
             return None
-        return self.asks[0]["price"] - self.bids[0]["price"]
+        return float(self.ask_px[0] - self.bid_px[0])
     
     def liquidity_within_bps(self, bps: float) -> Dict[str, float]:
         """Calculate available liquidity within given basis points of mid price"""
@@ -106,26 +298,38 @@ class OrderBook:
         if mid is None:
             return {"bid_liquidity": 0.0, "ask_liquidity": 0.0}
         
-        threshold = mid * bps / 10000  # Convert bps to price
-        bid_liquidity = sum(b["size"] for b in self.bids if mid - b["price"] <= threshold)
-        ask_liquidity = sum(a["size"] for a in self.asks if a["price"] - mid <= threshold)
+        threshold = mid * bps * 1e-4  # Convert bps to price
+        
+        # Both sides are sorted best-first, so the levels in range are a prefix of each.
+        # Bids are descending: search the reversed (ascending) view and count from the top.
+        bid_px = self.bid_px
+        k = bid_px.size - int(np.searchsorted(bid_px[::-1], mid - threshold, side="left"))
+        bid_liquidity = float(self.bid_sz[:k].sum())
+        
+        k = int(np.searchsorted(self.ask_px, mid + threshold, side="right"))
+        ask_liquidity = float(self.ask_sz[:k].sum())
         
         return {"bid_liquidity": bid_liquidity, "ask_liquidity": ask_liquidity}
     
     def to_market_data(self) -> MarketData:
         return MarketData(
             instrument_id=self.instrument_id,
-            timestamp=self.timestamp,
+            timestamp_ns=self.timestamp_ns,
             data_type=MarketDataType.ORDERBOOK,
             exchange=self.exchange,
-            data={"bids": self.bids, "asks": self.asks},
+            data={
+                "bid_px": self.bid_px,
+                "bid_sz": self.bid_sz,
+                "ask_px": self.ask_px,
+                "ask_sz": self.ask_sz
+            },
             source=self.exchange
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
-    order_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    order_id: str = field(default_factory=_next_id)
     instrument_id: str = ""
     order_type: OrderType = OrderType.MARKET
     side: OrderSide = OrderSide.BUY
@@ -134,11 +338,12 @@ class Order:
     stop_price: Optional[float] = None
     time_in_force: TimeInForce = TimeInForce.GTC
     exchange: str = ""
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at_ns: int = field(default_factory=time.time_ns)
+    updated_at_ns: int = field(default_factory=time.time_ns)
     status: OrderStatus = OrderStatus.PENDING_NEW
     filled_quantity: float = 0.0
     average_fill_price: Optional[float] = None
+    fill_notional: float = 0.0  # Sum of price * quantity over all fills
     client_order_id: Optional[str] = None
     parent_order_id: Optional[str] = None
     strategy_id: Optional[str] = None
@@ -146,33 +351,51 @@ class Order:
     execution_instructions: Dict[str, Any] = field(default_factory=dict)
     expiry_date: Optional[datetime] = None
     
+    def __post_init__(self):
+        self.instrument_id = sys.intern(self.instrument_id)
+        self.exchange = sys.intern(self.exchange)
+        if self.strategy_id is not None:
+            self.strategy_id = sys.intern(self.strategy_id)
+    
+    @property
+    def created_at(self) -> datetime:
+        return ns_to_datetime(self.created_at_ns)
+    
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self.created_at_ns = datetime_to_ns(value)
+    
+    @property
+    def updated_at(self) -> datetime:
+        return ns_to_datetime(self.updated_at_ns)
+    
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        self.updated_at_ns = datetime_to_ns(value)
+    
     def remaining_quantity(self) -> float:
         return self.quantity - self.filled_quantity
     
     def is_active(self) -> bool:
-        active_statuses = {
-            OrderStatus.PENDING_NEW,
-            OrderStatus.NEW,
-            OrderStatus.PARTIALLY_FILLED
-        }
-        return self.status in active_statuses
+        return self.status in _ACTIVE_STATUSES
     
     def to_dict(self) -> Dict:
         return {
             "order_id": self.order_id,
             "instrument_id": self.instrument_id,
-            "order_type": self.order_type.name,
-            "side": self.side.name,
+            "order_type": _ENUM_NAMES[self.order_type],
+            "side": _ENUM_NAMES[self.side],
             "quantity": self.quantity,
             "price": self.price,
             "stop_price": self.stop_price,
-            "time_in_force": self.time_in_force.name,
+            "time_in_force": _ENUM_NAMES[self.time_in_force],
             "exchange": self.exchange,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
-            "status": self.status.name,
+            "status": _ENUM_NAMES[self.status],
             "filled_quantity": self.filled_quantity,
             "average_fill_price": self.average_fill_price,
+            "fill_notional": self.fill_notional,
             "client_order_id": self.client_order_id,
             "parent_order_id": self.parent_order_id,
             "strategy_id": self.strategy_id,
@@ -186,18 +409,21 @@ class Order:
         order = cls(
             order_id=data_dict["order_id"],
             instrument_id=data_dict["instrument_id"],
-            order_type=OrderType[data_dict["order_type"]],
-            side=OrderSide[data_dict["side"]],
+            order_type=_ORDER_TYPE_BY_NAME[data_dict["order_type"]],
+            side=_ORDER_SIDE_BY_NAME[data_dict["side"]],
             quantity=data_dict["quantity"],
             price=data_dict["price"],
             stop_price=data_dict["stop_price"],
-            time_in_force=TimeInForce[data_dict["time_in_force"]],
+            time_in_force=_TIME_IN_FORCE_BY_NAME[data_dict["time_in_force"]],
             exchange=data_dict["exchange"],
-            created_at=datetime.fromisoformat(data_dict["created_at"]),
-            updated_at=datetime.fromisoformat(data_dict["updated_at"]),
-            status=OrderStatus[data_dict["status"]],
+            created_at_ns=datetime_to_ns(datetime.fromisoformat(data_dict["created_at"])),
+            updated_at_ns=datetime_to_ns(datetime.fromisoformat(data_dict["updated_at"])),
+            status=_ORDER_STATUS_BY_NAME[data_dict["status"]],
             filled_quantity=data_dict["filled_quantity"],
             average_fill_price=data_dict["average_fill_price"],
+            fill_notional=data_dict.get(
+                "fill_notional", (data_dict["average_fill_price"] or 0.0) * data_dict["filled_quantity"]
+            ),
             client_order_id=data_dict.get("client_order_id"),
             parent_order_id=data_dict.get("parent_order_id"),
             strategy_id=data_dict.get("strategy_id"),
@@ -209,19 +435,31 @@ class Order:
         return order
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
-    trade_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    trade_id: str = field(default_factory=_next_id)
     order_id: str = ""
     instrument_id: str = ""
     quantity: float = 0.0
     price: float = 0.0
     side: OrderSide = OrderSide.BUY
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp_ns: int = field(default_factory=time.time_ns)
     exchange: str = ""
     commission: float = 0.0
     commission_currency: str = "USD"
     
+    def __post_init__(self):
+        self.instrument_id = sys.intern(self.instrument_id)
+        self.exchange = sys.intern(self.exchange)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.timestamp_ns = datetime_to_ns(value)
+    
     def to_dict(self) -> Dict:
         return {
             "trade_id": self.trade_id,
@@ -229,7 +467,7 @@ class Trade:
             "instrument_id": self.instrument_id,
             "quantity": self.quantity,
             "price": self.price,
-            "side": self.side.name,
+            "side": _ENUM_NAMES[self.side],
             "timestamp": self.timestamp.isoformat(),
             "exchange": self.exchange,
             "commission": self.commission,
@@ -237,7 +475,7 @@ class Trade:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     instrument_id: str
     quantity: float = 0.0
@@ -246,11 +484,24 @@ class Position:
     realized_pnl: float = 0.0
     unrealized_pnl: float = 0.0
     position_value: float = 0.0
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp_ns: int = field(default_factory=time.time_ns)
     open_orders: List[str] = field(default_factory=list)
     strategy_allocations: Dict[str, float] = field(default_factory=dict)
     exchange: Optional[str] = None
     
+    def __post_init__(self):
+        self.instrument_id = sys.intern(self.instrument_id)
+        if self.exchange is not None:
+            self.exchange = sys.intern(self.exchange)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.timestamp_ns = datetime_to_ns(value)
+    
     def update_price(self, new_price: float) -> None:
         if self.quantity == 0:
             self.unrealized_pnl = 0.0
@@ -258,68 +509,28 @@ class Position:
             self.current_price = new_price
             return
         
-        old_unrealized_pnl = self.unrealized_pnl
+        quantity = self.quantity
         self.current_price = new_price
-        self.position_value = self.quantity * new_price
+        self.position_value = quantity * new_price
         
-        # Calculate unrealized P&L
-        if self.quantity > 0:  # Long position
-            self.unrealized_pnl = self.quantity * (new_price - self.average_entry_price)
-        else:  # Short position
-            self.unrealized_pnl = self.quantity * (self.average_entry_price - new_price)
+        # Calculate unrealized P&L; the signed quantity covers both long and short
+        self.unrealized_pnl = quantity * (new_price - self.average_entry_price)
     
     def apply_trade(self, trade: Trade) -> None:
         """Update position with a new trade"""
-        old_quantity = self.quantity
-        old_cost_basis = abs(old_quantity) * self.average_entry_price if old_quantity != 0 else 0
-        
-        # Update quantity based on trade side
-        if trade.side == OrderSide.BUY:
-            trade_quantity = trade.quantity
-        else:  # SELL
-            trade_quantity = -trade.quantity
-        
-        # Calculate new position
-        new_quantity = old_quantity + trade_quantity
+        trade_price = float(trade.price)
+        trade_quantity = float(trade.quantity) if trade.side == OrderSide.BUY else -float(trade.quantity)
         
-        # Update realized P&L if crossing zero or reducing position
-        if (old_quantity > 0 and trade_quantity < 0) or (old_quantity < 0 and trade_quantity > 0):
-            # Closing or reducing position
-            if abs(trade_quantity) <= abs(old_quantity):
-                # Partial or full closure
-                closing_quantity = min(abs(trade_quantity), abs(old_quantity))
-                if old_quantity > 0:  # Long position being reduced
-                    self.realized_pnl += closing_quantity * (trade.price - self.average_entry_price)
-                else:  # Short position being reduced
-                    self.realized_pnl += closing_quantity * (self.average_entry_price - trade.price)
-            else:
-                # Position crosses zero (flips)
-                # Realize P&L on the entire old position
-                if old_quantity > 0:  # Long to short
-                    self.realized_pnl += old_quantity * (trade.price - self.average_entry_price)
-                else:  # Short to long
-                    self.realized_pnl += abs(old_quantity) * (self.average_entry_price - trade.price)
-                
-                # Remaining quantity becomes the new position
-                new_position_quantity = abs(trade_quantity) - abs(old_quantity)
-                new_position_quantity *= 1 if trade_quantity > 0 else -1
-                self.average_entry_price = trade.price
-                self.quantity = new_position_quantity
-                self.update_price(trade.price)
-                return
-        
-        # Update average entry price if increasing position
-        if new_quantity != 0:
-            # If same direction or from zero, update average price
-            if old_quantity == 0 or (old_quantity > 0 and new_quantity > 0) or (old_quantity < 0 and new_quantity < 0):
-                new_cost_basis = old_cost_basis + abs(trade_quantity) * trade.price
-                self.average_entry_price = new_cost_basis / abs(new_quantity)
-        else:
-            # Position closed exactly
-            self.average_entry_price = 0
-        
-        self.quantity = new_quantity
-        self.update_price(trade.price)
+        # The kernel also marks the position at the fill price, so there is no
+        # separate update_price pass
+        (quantity, self.average_entry_price,
+         self.realized_pnl, self.unrealized_pnl) = apply_trade_kernel(
+            float(self.quantity), float(self.average_entry_price), float(self.realized_pnl),
+            trade_quantity, trade_price
+        )
+        self.quantity = quantity
+        self.current_price = trade_price
+        self.position_value = quantity * trade_price
     
     def to_dict(self) -> Dict:
         return {
@@ -337,29 +548,53 @@ class Position:
         }
 
 
-class EventType(Enum):
-    MARKET_DATA = auto()
-    ORDER_UPDATE = auto()
-    TRADE_UPDATE = auto()
-    POSITION_UPDATE = auto()
-    STRATEGY_SIGNAL = auto()
-    RISK_CHECK = auto()
-    SYSTEM_EVENT = auto()
+@dataclass(slots=True)
+class RiskCheckResult:
+    """Payload of RISK_CHECK events"""
+    passed: bool
+    messages: Tuple[str, ...]
+    check_type: str  # "order" or "periodic"
+    order_id: Optional[str] = None
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+    
+    def to_dict(self) -> Dict:
+        return {
+            "passed": self.passed,
+            "order_id": self.order_id,
+            "messages": list(self.messages),
+            "timestamp": self.timestamp.isoformat(),
+            "check_type": self.check_type
+        }
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     event_type: EventType
-    timestamp: datetime = field(default_factory=datetime.utcnow)
+    timestamp_ns: int = field(default_factory=time.time_ns)
     data: Any = None
     source: str = ""
     target: Optional[str] = None
     sequence_id: Optional[int] = None
     priority: int = 1  # Lower value means higher priority
     
+    def __post_init__(self):
+        self.source = sys.intern(self.source)
+    
+    @property
+    def timestamp(self) -> datetime:
+        return ns_to_datetime(self.timestamp_ns)
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self.timestamp_ns = datetime_to_ns(value)
+    
     def to_dict(self) -> Dict:
         result = {
-            "event_type": self.event_type.name,
+            "event_type": _ENUM_NAMES[self.event_type],
             "timestamp": self.timestamp.isoformat(),
             "source": self.source,
             "target": self.target,
@@ -3,126 +3,290 @@ import time
 from datetime import datetime
 from typing import Dict, List, Callable, Awaitable, Any, Optional, Set, Tuple
 import heapq
+import itertools
 import logging
-from collections import defaultdict
+import warnings
+from collections import defaultdict, deque
 
-from .data_structures import Event, EventType
+from .data_structures import Event, EventType, Order, Trade, ns_to_datetime
 
 logger = logging.getLogger(__name__)
 
+_perf_counter = time.perf_counter
+
+# Payload type each event type must carry; checked once at publish time so
+# handlers can rely on it without their own isinstance checks
+_PAYLOAD_TYPES = {
+    EventType.ORDER_UPDATE: Order,
+    EventType.TRADE_UPDATE: Trade,
+}
+
+# Event types publish() may drop when the queue is full; every other type waits
+# for room, since losing e.g. a fill would corrupt position and risk state
+_DROPPABLE_TYPES = frozenset({EventType.MARKET_DATA})
+
+
+class _EventQueueView:
+    """Deprecated stand-in for the asyncio.PriorityQueue once exposed as EventProcessor.event_queue"""
+    
+    def __init__(self, processor: "EventProcessor"):
+        self._processor = processor
+    
+    @property
+    def maxsize(self) -> int:
+        return self._processor.max_queue_size
+    
+    def qsize(self) -> int:
+        return self._processor.qsize()
+    
+    def empty(self) -> bool:
+        return not self._processor.qsize()
+    
+    def full(self) -> bool:
+        return self._processor.qsize() >= self._processor.max_queue_size
+    
+    async def put(self, item: Tuple[int, Any, Event]):
+        await self._processor.publish(item[-1])
+    
+    def put_nowait(self, item: Tuple[int, Any, Event]):
+        if not self._processor.publish_nowait(item[-1]):
+            raise asyncio.QueueFull
+
 
 class EventProcessor:
-    def __init__(self, max_queue_size: int = 10000):
-        # Main event queue
-        self.event_queue = asyncio.PriorityQueue(maxsize=max_queue_size)
+    def __init__(self, max_queue_size: int = 10000, max_batch_size: int = 64):
+        # Main event queue: a heap of (priority, insertion sequence, event) drained by a
+        # single consumer, so no locking is needed; _notify wakes the loop when it is empty
+        self.max_queue_size = max_queue_size
+        self._heap: List[Tuple[int, int, Event]] = []
+        self._heap_seq = itertools.count()
+        self._notify = asyncio.Event()
+        self._space = asyncio.Event()  # Set by the consumer after it drains events
+        self._consumer: Optional[asyncio.Task] = None  # Task running event_loop()
+        self.max_batch_size = max_batch_size  # Events drained per loop iteration
         
-        # Event handlers organized by event type
-        self.handlers: Dict[EventType, List[Callable[[Event], Awaitable[None]]]] = defaultdict(list)
+        # Event handlers organized by event type; a plain dict so that only
+        # event types with at least one subscriber ever have a key
+        self.handlers: Dict[EventType, List[Callable[[Event], Awaitable[None]]]] = {}
         
         # Sequence tracking for ordered events
         self.sequence_counters: Dict[str, int] = defaultdict(int)
-        self.pending_events: Dict[str, Dict[int, Event]] = defaultdict(dict)
+        # Per-source min-heaps of (sequence_id, id(event), event) buffered ahead of sequence
+        self.pending_events: Dict[str, List[Tuple[int, int, Event]]] = defaultdict(list)
         
         # Performance metrics
-        self.event_processing_times: Dict[EventType, List[float]] = defaultdict(list)
-        self.queue_size_history: List[Tuple[datetime, int]] = []
+        self.event_processing_times: Dict[EventType, deque] = defaultdict(lambda: deque(maxlen=1000))
+        # Bounded ring of (time_ns, queue size) samples taken every 5 seconds
+        self.queue_size_history: deque = deque(maxlen=1024)
         self.dropped_events_count = 0
         
         # Control flags
         self.running = False
-        self.throttle_levels: Dict[EventType, int] = {}  # Events per second limits
+        self._stopped = False  # Set by stop() so publishers stop waiting for room
         self._last_metrics_log = time.time()
-        self._throttle_counters: Dict[EventType, int] = defaultdict(int)
-        self._throttle_last_reset: Dict[EventType, float] = defaultdict(time.time)
+        
+        # Throttle bookkeeping indexed by EventType.value (-1 means unthrottled)
+        slots = max(event_type.value for event_type in EventType) + 1
+        self._throttle_limits: List[int] = [-1] * slots  # Events per second limits
+        self._throttle_counters: List[int] = [0] * slots
+        self._throttle_last_reset: List[float] = [time.time()] * slots
         
     async def start(self):
         """Start the event processing loop"""
         self.running = True
+        self._stopped = False
         await self.event_loop()
         
     async def stop(self):
         """Stop the event processing loop"""
         self.running = False
+        self._stopped = True
+        self._notify.set()
+        self._space.set()  # Release publishers waiting for room
+    
+    @property
+    def event_queue(self) -> _EventQueueView:
+        """Deprecated: use qsize(), publish() and publish_nowait() instead"""
+        warnings.warn(
+            "EventProcessor.event_queue is deprecated; use qsize(), publish() and publish_nowait()",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        return _EventQueueView(self)
+    
+    def set_throttle(self, event_type: EventType, max_events_per_second: Optional[int]):
+        """Limit how many events of a type can be published per second (None removes the limit)"""
+        idx = event_type.value
+        self._throttle_limits[idx] = -1 if max_events_per_second is None else max_events_per_second
+        self._throttle_counters[idx] = 0
+        self._throttle_last_reset[idx] = time.time()
+    
+    def qsize(self) -> int:
+        """Number of events waiting to be processed"""
+        return len(self._heap)
         
     def add_handler(self, event_type: EventType, handler: Callable[[Event], Awaitable[None]]):
         """Register a handler for a specific event type"""
-        self.handlers[event_type].append(handler)
+        self.handlers.setdefault(event_type, []).append(handler)
+        
+    def add_handlers(self, mapping: Dict[EventType, Callable[[Event], Awaitable[None]]]):
+        """Register one handler for each event type in the mapping"""
+        handlers = self.handlers
+        for event_type, handler in mapping.items():
+            handlers.setdefault(event_type, []).append(handler)
         
     def remove_handler(self, event_type: EventType, handler: Callable[[Event], Awaitable[None]]):
         """Remove a handler for a specific event type"""
-        if event_type in self.handlers:
-            try:
-                self.handlers[event_type].remove(handler)
-            except ValueError:
-                pass
+        handlers = self.handlers.get(event_type)
+        if handlers is None:
+            return
+        try:
+            handlers.remove(handler)
+        except ValueError:
+            return
+        if not handlers:
+            del self.handlers[event_type]
     
     async def publish(self, event: Event) -> bool:
         """
         Publish an event to the event queue
+        When the queue is full, market data is dropped and every other event
+        waits for room until the processor is stopped
+        Returns True if the event was queued, False if dropped
+        """
+        if event.event_type not in _DROPPABLE_TYPES:
+            if self._on_consumer():
+                # Handlers run on the consumer, which is what frees room; waiting
+                # here would deadlock, so let the queue overfill instead
+                return self._enqueue(event, bounded=False)
+            await self._wait_for_room()
+        return self.publish_nowait(event)
+    
+    async def publish_batch(self, events: List[Event]) -> int:
+        """
+        Publish several events in order with a single wake-up of the event loop,
+        applying publish()'s rules when the queue is full
+        Returns the number of events queued
+        """
+        on_consumer = self._on_consumer()
+        queued = 0
+        for event in events:
+            droppable = event.event_type in _DROPPABLE_TYPES
+            if not droppable and not on_consumer:
+                await self._wait_for_room()
+            if self._enqueue(event, bounded=droppable or not on_consumer):
+                queued += 1
+        return queued
+    
+    async def _wait_for_room(self):
+        """Wait until the queue has room or the processor is stopped"""
+        heap = self._heap
+        space = self._space
+        while len(heap) >= self.max_queue_size and not self._stopped:
+            space.clear()
+            await space.wait()
+    
+    def publish_many(self, events: List[Event]) -> int:
+        """
+        Publish several events with a single wake-up of the event loop
+        Never waits for room, so events are dropped if the queue is full; when
+        called from a handler, only market data is dropped and the rest overfill
+        Returns the number of events queued
+        """
+        on_consumer = self._on_consumer()
+        queued = 0
+        for event in events:
+            if self._enqueue(event, bounded=not on_consumer or event.event_type in _DROPPABLE_TYPES):
+                queued += 1
+        return queued
+    
+    def _on_consumer(self) -> bool:
+        """Whether the caller is running on the task that drains the queue"""
+        consumer = self._consumer
+        if consumer is None:
+            return False
+        try:
+            return asyncio.current_task() is consumer
+        except RuntimeError:
+            return False  # No running loop in this thread
+    
+    def publish_nowait(self, event: Event) -> bool:
+        """
+        Queue an event without yielding to the event loop
         Returns True if the event was queued, False if dropped
         """
+        return self._enqueue(event, bounded=True)
+    
+    def _enqueue(self, event: Event, bounded: bool) -> bool:
+        """Validate, throttle and push an event; a bounded push drops it when the queue is full"""
+        payload_type = _PAYLOAD_TYPES.get(event.event_type)
+        if payload_type is not None and not isinstance(event.data, payload_type):
+            logger.error("Invalid %s payload in event: %s", event.event_type.name, event)
+            self.dropped_events_count += 1
+            return False
+        
         # Check throttling
-        if event.event_type in self.throttle_levels:
-            max_events = self.throttle_levels[event.event_type]
+        idx = event.event_type.value
+        max_events = self._throttle_limits[idx]
+        if max_events >= 0:
             current_time = time.time()
             
             # Reset counter every second
-            if current_time - self._throttle_last_reset[event.event_type] >= 1.0:
-                self._throttle_counters[event.event_type] = 0
-                self._throttle_last_reset[event.event_type] = current_time
+            if current_time - self._throttle_last_reset[idx] >= 1.0:
+                self._throttle_counters[idx] = 0
+                self._throttle_last_reset[idx] = current_time
             
             # Check if exceeding throttle limit
-            if self._throttle_counters[event.event_type] >= max_events:
+            if self._throttle_counters[idx] >= max_events:
                 self.dropped_events_count += 1
                 return False
             
-            self._throttle_counters[event.event_type] += 1
+            self._throttle_counters[idx] += 1
         
-        try:
-            # Use priority and timestamp for queue ordering
-            await self.event_queue.put((event.priority, time.time(), event))
-            
-            # Record metrics every 5 seconds
-            current_time = time.time()
-            if current_time - self._last_metrics_log > 5:
-                self.queue_size_history.append((datetime.utcnow(), self.event_queue.qsize()))
-                self._last_metrics_log = current_time
-                
-            return True
-        except asyncio.QueueFull:
+        if bounded and len(self._heap) >= self.max_queue_size:
             self.dropped_events_count += 1
-            logger.warning(f"Event queue full, dropped event of type {event.event_type}")
+            logger.warning("Event queue full, dropped event of type %s", event.event_type)
             return False
+        
+        # Use priority and insertion order for queue ordering
+        heapq.heappush(self._heap, (event.priority, next(self._heap_seq), event))
+        self._notify.set()
+        
+        # Record metrics every 5 seconds
+        current_time = time.time()
+        if current_time - self._last_metrics_log > 5:
+            self.queue_size_history.append((time.time_ns(), len(self._heap)))
+            self._last_metrics_log = current_time
+            
+        return True
     
     async def _process_event(self, event: Event):
         """Process a single event by calling all registered handlers"""
-        if event.event_type not in self.handlers:
+        event_type = event.event_type
+        handlers = self.handlers.get(event_type)
+        if not handlers:
             return
         
-        start_time = time.time()
+        start_time = _perf_counter()
         
         # Process with all registered handlers
-        for handler in self.handlers[event.event_type]:
+        for handler in handlers:
             try:
                 await handler(event)
             except Exception as e:
-                logger.exception(f"Error in event handler for {event.event_type}: {e}")
+                logger.exception("Error in event handler for %s: %s", event_type, e)
         
         # Record processing time
-        processing_time = time.time() - start_time
-        self.event_processing_times[event.event_type].append(processing_time)
-        
-        # Trim performance data to avoid memory growth
-        if len(self.event_processing_times[event.event_type]) > 1000:
-            self.event_processing_times[event.event_type] = self.event_processing_times[event.event_type][-1000:]
+        self.event_processing_times[event_type].append(_perf_counter() - start_time)
     
-    async def _handle_sequenced_event(self, event: Event):
+    def _handle_sequenced_event_sync(self, event: Event) -> Optional[List[Event]]:
         """
         Handle events that need to be processed in sequence
-        Returns True if the event should be processed now, False if it should be buffered
+        Returns None if the event carries no sequence id and should be processed now,
+        otherwise the (possibly empty) list of events that are now in sequence, in order
         """
         if event.sequence_id is None:
-            return True
+            return None
         
         source = event.source
         expected_seq = self.sequence_counters[source]
@@ -130,52 +294,89 @@ class EventProcessor:
         if event.sequence_id == expected_seq:
             # This is the next expected event, process it immediately
             self.sequence_counters[source] += 1
+            ready = [event]
             
-            # Process any pending events that are now in sequence
-            next_seq = expected_seq + 1
-            while next_seq in self.pending_events[source]:
-                pending_event = self.pending_events[source].pop(next_seq)
-                await self._process_event(pending_event)
+            # Release any pending events that are now in sequence
+            pending = self.pending_events.get(source)
+            while pending:
+                next_seq = self.sequence_counters[source]
+                if pending[0][0] > next_seq:
+                    break
+                _, _, pending_event = heapq.heappop(pending)
+                if pending_event.sequence_id < next_seq:
+                    continue  # Duplicate of an event that was already processed
+                ready.append(pending_event)
                 self.sequence_counters[source] += 1
-                next_seq += 1
                 
-            return True
+            return ready
         elif event.sequence_id > expected_seq:
             # This event is ahead in the sequence, buffer it
-            self.pending_events[source][event.sequence_id] = event
-            return False
+            heapq.heappush(self.pending_events[source], (event.sequence_id, id(event), event))
+            return []
         else:
             # This event is out of sequence (too old)
-            logger.warning(f"Received out-of-sequence event: got {event.sequence_id}, expected {expected_seq}")
-            return False
+            logger.warning("Received out-of-sequence event: got %d, expected %d", event.sequence_id, expected_seq)
+            return []
     
     async def event_loop(self):
         """Main event processing loop"""
         logger.info("Event processor started")
+        self._consumer = asyncio.current_task()
+        
+        # Bind hot attributes to locals once; they are looked up for every event
+        heap = self._heap
+        heappop = heapq.heappop
+        notify = self._notify
+        space = self._space
+        process_event = self._process_event
+        handle_sequenced = self._handle_sequenced_event_sync
         
         while self.running:
             try:
-                # Get the next event from the queue
-                _, _, event = await self.event_queue.get()
+                # Wait for events if the queue is empty
+                if not heap:
+                    notify.clear()
+                    await notify.wait()
+                    continue
                 
-                # Handle sequenced events
-                should_process = await self._handle_sequenced_event(event)
+                # Drain a batch of events in priority order, then process them in
+                # sequence so ordering between related events is preserved
+                batch = [heappop(heap)[2] for _ in range(min(self.max_batch_size, len(heap)))]
+                space.set()
                 
-                if should_process:
-                    await self._process_event(event)
+                for event in batch:
+                    try:
+                        if event.sequence_id is None:
+                            await process_event(event)
+                            continue
+                        
+                        # Handle sequenced events
+                        for ready_event in handle_sequenced(event):
+                            await process_event(ready_event)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.exception("Error in event processing loop: %s", e)
                 
-                self.event_queue.task_done()
+                # Let producers run between batches when handlers never yield
+                await asyncio.sleep(0)
                 
             except asyncio.CancelledError:
                 logger.info("Event processing loop cancelled")
                 break
             except Exception as e:
-                logger.exception(f"Error in event processing loop: {e}")
+                logger.exception("Error in event processing loop: %s", e)
+        
+        self._consumer = None
+    
+    def get_queue_size_history(self) -> List[Tuple[datetime, int]]:
+        """Get the sampled queue sizes as (timestamp, size) pairs, oldest first"""
+        return [(ns_to_datetime(ts), size) for ts, size in self.queue_size_history]
     
     def get_performance_metrics(self):
         """Get performance metrics for the event processor"""
         metrics = {
-            "queue_size": self.event_queue.qsize(),
+            "queue_size": len(self._heap),
             "dropped_events": self.dropped_events_count,
             "avg_processing_time_ms": {},
             "max_processing_time_ms": {},
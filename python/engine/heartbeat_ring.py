@@ -0,0 +1,100 @@
+"""
+Shared-memory ring of heartbeat samples for out-of-process consumers
+
+The engine writes one fixed-size record per heartbeat into a ring backed by
+multiprocessing.shared_memory, so dashboards and gateways in other processes
+can read engine health without subscribing to events or decoding JSON.
+
+Layout: a header holding the int64 count of records written and the int64
+slot count, followed by `slots` records of HEARTBEAT_DTYPE. The newest
+record is at (count - 1) % slots.
+"""
+
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+import numpy as np
+
+
+HEARTBEAT_DTYPE = np.dtype([
+    ('ts_ns', np.int64),
+    ('uptime_s', np.float64),
+    ('queue_size', np.int32),
+    ('active_orders', np.int32),
+    ('positions', np.int32),
+], align=True)
+
+_HEADER_BYTES = 64  # Keep the records off the header's cache line
+
+
+class HeartbeatRing:
+    """Fixed-capacity heartbeat ring in a named shared memory block"""
+    
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self.slots = slots
+        self._mask = slots - 1
+        self._header = np.ndarray((2,), dtype=np.int64, buffer=shm.buf)  # [count, slots]
+        self.records = np.ndarray((slots,), dtype=HEARTBEAT_DTYPE, buffer=shm.buf, offset=_HEADER_BYTES)
+    
+    @classmethod
+    def create(cls, slots: int = 4096, name: Optional[str] = None) -> 'HeartbeatRing':
+        """Allocate a new ring; slots must be a power of two"""
+        if slots <= 0 or slots & (slots - 1):
+            raise ValueError(f"Heartbeat ring slots must be a power of two, got {slots}")
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_HEADER_BYTES + HEARTBEAT_DTYPE.itemsize * slots
+        )
+        ring = cls(shm, slots, owner=True)
+        ring._header[:] = (0, slots)
+        return ring
+    
+    @classmethod
+    def attach(cls, name: str) -> 'HeartbeatRing':
+        """Open an existing ring created by another process"""
+        # Only the creator may unlink the block; a tracked reader's resource
+        # tracker would unlink it when the reader exits
+        if sys.version_info >= (3, 13):
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(shm._name, "shared_memory")
+        # Read the slot count from the header; the OS may report a rounded-up size
+        slots = int(np.ndarray((2,), dtype=np.int64, buffer=shm.buf)[1])
+        return cls(shm, slots, owner=False)
+    
+    @property
+    def name(self) -> str:
+        return self._shm.name
+    
+    @property
+    def count(self) -> int:
+        """Number of records written so far"""
+        return int(self._header[0])
+    
+    def write(self, ts_ns: int, uptime_s: float, queue_size: int, active_orders: int, positions: int):
+        """Write the next record, overwriting the oldest once the ring is full"""
+        count = int(self._header[0])
+        self.records[count & self._mask] = (ts_ns, uptime_s, queue_size, active_orders, positions)
+        # Publish the record only after it is fully written
+        self._header[0] = count + 1
+    
+    def latest(self) -> Optional[np.void]:
+        """Copy of the newest record, or None if nothing has been written"""
+        count = int(self._header[0])
+        if count == 0:
+            return None
+        return self.records[(count - 1) & self._mask].copy()
+    
+    def close(self):
+        """Release this process's mapping; the creator also removes the block"""
+        # Drop the array views first, they keep the buffer exported
+        self._header = None
+        self.records = None
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass  # Already removed by someone else
@@ -1,21 +1,40 @@
 import asyncio
 import logging
+import random
 import time
-from typing import Dict, List, Optional, Set, Callable, Awaitable
+from typing import Dict, List, Optional, Set, Callable, Awaitable, Tuple
 from datetime import datetime
 import json
+import dataclasses
+from collections import defaultdict, deque
 
 from .data_structures import Order, Trade, OrderStatus, OrderType, Event, EventType
 
 logger = logging.getLogger(__name__)
 
+# State snapshots kept per order; older ones are discarded
+ORDER_HISTORY_MAX = 256
+
+# Order states that accept cancel and modify requests
+_AMENDABLE_STATUSES = frozenset({OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED})
+
 
 class OrderManager:
     def __init__(self, event_processor):
         self.orders: Dict[str, Order] = {}  # order_id -> Order
         self.active_orders: Set[str] = set()  # Set of active order_ids
-        self.order_history: Dict[str, List[Order]] = {}  # order_id -> list of state changes
-        self.trades: Dict[str, List[Trade]] = {}  # order_id -> list of trades
+        # Secondary indexes over active_orders for filtered lookups
+        self._active_by_strategy: Dict[str, Set[str]] = {}  # strategy_id -> active order_ids
+        self._active_by_instrument: Dict[str, Set[str]] = {}  # instrument_id -> active order_ids
+        # Active order_ids in a dense list for O(1) random sampling, with each id's slot
+        self._active_list: List[str] = []
+        self._active_slots: Dict[str, int] = {}  # order_id -> index in _active_list
+        self.order_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=ORDER_HISTORY_MAX))  # order_id -> recent state snapshots
+        self.trades: Dict[str, List[Trade]] = defaultdict(list)  # order_id -> list of trades
+        
+        # Order counts by status, kept current as orders change state
+        self._status_counts: Dict[OrderStatus, int] = {status: 0 for status in OrderStatus}
+        self._last_status: Dict[str, OrderStatus] = {}  # order_id -> status last counted
         
         self.event_processor = event_processor
         self.order_handlers: Dict[str, Callable[[Order], Awaitable[None]]] = {}
@@ -27,9 +46,6 @@ class OrderManager:
     async def _handle_order_update(self, event: Event):
         """Process order update events"""
         order = event.data
-        if not isinstance(order, Order):
-            logger.error(f"Invalid order data in event: {event}")
-            return
         
         # Update the order in our state
         self._update_order_state(order)
@@ -39,43 +55,34 @@ class OrderManager:
             try:
                 await self.order_handlers[order.order_id](order)
             except Exception as e:
-                logger.exception(f"Error in order handler for {order.order_id}: {e}")
+                logger.exception("Error in order handler for %s: %s", order.order_id, e)
     
     async def _handle_trade_update(self, event: Event):
         """Process trade update events"""
         trade = event.data
-        if not isinstance(trade, Trade):
-            logger.error(f"Invalid trade data in event: {event}")
-            return
         
         # Store the trade
-        if trade.order_id not in self.trades:
-            self.trades[trade.order_id] = []
         self.trades[trade.order_id].append(trade)
         
         # Update the corresponding order
-        if trade.order_id in self.orders:
-            order = self.orders[trade.order_id]
-            order.filled_quantity += trade.quantity
+        order = self.orders.get(trade.order_id)
+        if order is not None:
             
-            # Calculate average fill price
-            if order.average_fill_price is None:
-                order.average_fill_price = trade.price
-            else:
-                prev_fill_qty = order.filled_quantity - trade.quantity
-                order.average_fill_price = (
-                    (order.average_fill_price * prev_fill_qty + trade.price * trade.quantity) / 
-                    order.filled_quantity
-                )
+            # Calculate average fill price from the running notional
+            order.fill_notional += trade.price * trade.quantity
+            filled_quantity = order.filled_quantity + trade.quantity
+            order.filled_quantity = filled_quantity
+            if filled_quantity:
+                order.average_fill_price = order.fill_notional / filled_quantity
             
             # Update order status
-            if abs(order.filled_quantity - order.quantity) < 1e-10:  # Filled completely
+            if filled_quantity >= order.quantity - 1e-10:  # Filled completely
                 order.status = OrderStatus.FILLED
-                self.active_orders.discard(order.order_id)
-            elif order.filled_quantity > 0:  # Partially filled
+                self._remove_active(order)
+            elif filled_quantity > 0:  # Partially filled
                 order.status = OrderStatus.PARTIALLY_FILLED
             
-            order.updated_at = datetime.utcnow()
+            order.updated_at_ns = time.time_ns()
             
             # Save order state change
             self._save_order_history(order)
@@ -94,21 +101,89 @@ class OrderManager:
         
         # Update active orders set
         if order.is_active():
-            self.active_orders.add(order.order_id)
+            self._add_active(order)
         else:
-            self.active_orders.discard(order.order_id)
+            self._remove_active(order)
         
         # Save order state change
         self._save_order_history(order)
     
+    def _add_active(self, order: Order):
+        """Add an order to the active set and its indexes"""
+        order_id = order.order_id
+        if order_id not in self._active_slots:
+            self._active_slots[order_id] = len(self._active_list)
+            self._active_list.append(order_id)
+        self.active_orders.add(order_id)
+        if order.strategy_id:
+            self._active_by_strategy.setdefault(order.strategy_id, set()).add(order_id)
+        self._active_by_instrument.setdefault(order.instrument_id, set()).add(order_id)
+    
+    def _remove_active(self, order: Order):
+        """Remove an order from the active set and its indexes"""
+        order_id = order.order_id
+        if order_id not in self.active_orders:
+            return
+        self.active_orders.discard(order_id)
+        
+        # Move the last id into the freed slot so the list stays dense
+        slot = self._active_slots.pop(order_id)
+        last_id = self._active_list.pop()
+        if last_id != order_id:
+            self._active_list[slot] = last_id
+            self._active_slots[last_id] = slot
+        
+        for index, key in ((self._active_by_strategy, order.strategy_id),
+                           (self._active_by_instrument, order.instrument_id)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(order_id)
+                if not ids:
+                    del index[key]
+    
+    @staticmethod
+    def _snapshot(order: Order) -> Tuple:
+        """Capture the fields of an order that change over its lifetime"""
+        return (order.status, order.quantity, order.price, order.filled_quantity,
+                order.average_fill_price, order.updated_at_ns)
+    
+    @staticmethod
+    def _hydrate(order: Order, snapshot: Tuple) -> Order:
+        """Rebuild a historical order by overlaying a snapshot on the current order"""
+        status, quantity, price, filled_quantity, average_fill_price, updated_at_ns = snapshot
+        return dataclasses.replace(
+            order,
+            status=status,
+            quantity=quantity,
+            price=price,
+            filled_quantity=filled_quantity,
+            average_fill_price=average_fill_price,
+            updated_at_ns=updated_at_ns
+        )
+    
+    def _track_status(self, order: Order):
+        """Move an order between status counts if its status changed"""
+        status = order.status
+        previous = self._last_status.get(order.order_id)
+        if previous is status:
+            return
+        if previous is not None:
+            self._status_counts[previous] -= 1
+        self._status_counts[status] += 1
+        self._last_status[order.order_id] = status
+    
     def _save_order_history(self, order: Order):
         """Save a snapshot of the order state in history"""
-        if order.order_id not in self.order_history:
-            self.order_history[order.order_id] = []
-        
-        # Create a copy of the order for history
-        order_copy = Order.from_dict(order.to_dict())
-        self.order_history[order.order_id].append(order_copy)
+        # Every state change is recorded here, so this keeps the status counts current
+        self._track_status(order)
+        
+        # Our own ORDER_UPDATE events come back through _handle_order_update;
+        # don't record the same state twice
+        snapshot = self._snapshot(order)
+        history = self.order_history[order.order_id]
+        if history and history[-1] == snapshot:
+            return
+        history.append(snapshot)
     
     async def submit_order(self, order: Order, 
                           callback: Optional[Callable[[Order], Awaitable[None]]] = None) -> str:
@@ -118,8 +193,8 @@ class OrderManager:
         """
         # Set initial order state
         order.status = OrderStatus.PENDING_NEW
-        order.created_at = datetime.utcnow()
-        order.updated_at = order.created_at
+        order.created_at_ns = time.time_ns()
+        order.updated_at_ns = order.created_at_ns
         
         # Store the order
         self._update_order_state(order)
@@ -142,32 +217,42 @@ class OrderManager:
         Request to cancel an order
         Returns True if cancel request was submitted, False if order doesn't exist or is already inactive
         """
-        if order_id not in self.orders or order_id not in self.active_orders:
-            logger.warning(f"Attempted to cancel non-existent or inactive order: {order_id}")
+        event = self._request_cancel(order_id)
+        if event is None:
             return False
         
+        # Publish cancel request event
+        await self.event_processor.publish(event)
+        return True
+    
+    def _request_cancel(self, order_id: str) -> Optional[Event]:
+        """
+        Move an order to PENDING_CANCEL
+        Returns the cancel request event to publish, or None if the order can't be cancelled
+        """
+        if order_id not in self.orders or order_id not in self.active_orders:
+            logger.warning("Attempted to cancel non-existent or inactive order: %s", order_id)
+            return None
+        
         order = self.orders[order_id]
         
         # Only cancel if in a cancellable state
-        if order.status not in [OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED]:
-            logger.warning(f"Order {order_id} with status {order.status} cannot be cancelled")
-            return False
+        if order.status not in _AMENDABLE_STATUSES:
+            logger.warning("Order %s with status %s cannot be cancelled", order_id, order.status)
+            return None
         
         # Update order status
         order.status = OrderStatus.PENDING_CANCEL
-        order.updated_at = datetime.utcnow()
+        order.updated_at_ns = time.time_ns()
         
         # Save order state change
         self._save_order_history(order)
         
-        # Publish cancel request event
-        await self.event_processor.publish(Event(
+        return Event(
             event_type=EventType.ORDER_UPDATE,
             data=order,
             source="order_manager"
-        ))
-        
-        return True
+        )
     
     async def modify_order(self, order_id: str, 
                           price: Optional[float] = None, 
@@ -177,16 +262,20 @@ class OrderManager:
         Returns True if modify request was submitted
         """
         if order_id not in self.orders or order_id not in self.active_orders:
-            logger.warning(f"Attempted to modify non-existent or inactive order: {order_id}")
+            logger.warning("Attempted to modify non-existent or inactive order: %s", order_id)
             return False
         
         order = self.orders[order_id]
         
         # Only modify if in a modifiable state
-        if order.status not in [OrderStatus.NEW, OrderStatus.PARTIALLY_FILLED]:
-            logger.warning(f"Order {order_id} with status {order.status} cannot be modified")
+        if order.status not in _AMENDABLE_STATUSES:
+            logger.warning("Order %s with status %s cannot be modified", order_id, order.status)
             return False
         
+        # Nothing to do if the request doesn't change the order
+        if (price is None or price == order.price) and (quantity is None or quantity == order.quantity):
+            return True
+        
         # Create a new order for the modification
         modified_order = Order.from_dict(order.to_dict())
         
@@ -195,12 +284,12 @@ class OrderManager:
             modified_order.price = price
         if quantity is not None:
             # Can only increase quantity for partially filled orders
-            if order.status == OrderStatus.PARTIALLY_FILLED and quantity < order.filled_quantity:
-                logger.warning(f"Cannot reduce quantity below filled amount for order {order_id}")
+            if order.status is OrderStatus.PARTIALLY_FILLED and quantity < order.filled_quantity:
+                logger.warning("Cannot reduce quantity below filled amount for order %s", order_id)
                 return False
             modified_order.quantity = quantity
         
-        modified_order.updated_at = datetime.utcnow()
+        modified_order.updated_at_ns = time.time_ns()
         
         # Save the new state
         self._update_order_state(modified_order)
@@ -219,8 +308,11 @@ class OrderManager:
         return self.orders.get(order_id)
     
     def get_order_history(self, order_id: str) -> List[Order]:
-        """Get the history of an order's state changes"""
-        return self.order_history.get(order_id, [])
+        """Get the history of an order's state changes (the most recent ORDER_HISTORY_MAX)"""
+        order = self.orders.get(order_id)
+        if order is None:
+            return []
+        return [self._hydrate(order, snapshot) for snapshot in self.order_history.get(order_id, [])]
     
     def get_trades(self, order_id: str) -> List[Trade]:
         """Get all trades associated with an order"""
@@ -229,25 +321,43 @@ class OrderManager:
     def get_active_orders(self, strategy_id: Optional[str] = None, 
                          instrument_id: Optional[str] = None) -> List[Order]:
         """Get all currently active orders, optionally filtered"""
-        result = []
-        for order_id in self.active_orders:
-            order = self.orders[order_id]
-            
-            # Apply filters
-            if strategy_id and order.strategy_id != strategy_id:
-                continue
-            if instrument_id and order.instrument_id != instrument_id:
-                continue
-                
-            result.append(order)
-        
-        return result
+        # Narrow down through the indexes instead of scanning every active order
+        if strategy_id and instrument_id:
+            by_strategy = self._active_by_strategy.get(strategy_id, set())
+            by_instrument = self._active_by_instrument.get(instrument_id, set())
+            order_ids = by_strategy & by_instrument
+        elif strategy_id:
+            order_ids = self._active_by_strategy.get(strategy_id, ())
+        elif instrument_id:
+            order_ids = self._active_by_instrument.get(instrument_id, ())
+        else:
+            order_ids = self.active_orders
+        
+        orders = self.orders
+        return [orders[order_id] for order_id in order_ids]
+    
+    def random_active_order(self) -> Optional[Order]:
+        """Get an active order chosen uniformly at random, or None if there are none"""
+        active_list = self._active_list
+        if not active_list:
+            return None
+        return self.orders[active_list[random.randrange(len(active_list))]]
     
     async def batch_cancel_orders(self, order_ids: List[str]) -> Dict[str, bool]:
-        """Cancel multiple orders at once"""
+        """Cancel multiple orders at once, publishing the cancel requests as one batch"""
         results = {}
+        events = []
         for order_id in order_ids:
-            results[order_id] = await self.cancel_order(order_id)
+            try:
+                event = self._request_cancel(order_id)
+            except Exception as e:
+                logger.error("Error cancelling order %s: %s", order_id, e)
+                event = None
+            results[order_id] = event is not None
+            if event is not None:
+                events.append(event)
+        
+        await self.event_processor.publish_batch(events)
         return results
     
     async def cancel_all_orders(self, strategy_id: Optional[str] = None, 
@@ -267,12 +377,7 @@ class OrderManager:
         active_count = len(self.active_orders)
         total_count = len(self.orders)
         
-        status_counts = {}
-        for status in OrderStatus:
-            status_counts[status.name] = 0
-        
-        for order in self.orders.values():
-            status_counts[order.status.name] += 1
+        status_counts = {status.name: count for status, count in self._status_counts.items()}
         
         return {
             "active_orders": active_count,
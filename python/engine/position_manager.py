@@ -1,19 +1,86 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional, Set, Tuple
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import json
+import numpy as np
 
-from .data_structures import Position, Trade, OrderSide, Event, EventType
+from .data_structures import Position, Trade, OrderSide, Event, EventType, MarketDataType
 
 logger = logging.getLogger(__name__)
 
 
+def _mid_from_quote(data: Dict) -> Optional[float]:
+    """For quote data, use mid price"""
+    bid = data.get('bid')
+    ask = data.get('ask')
+    if bid is None or ask is None:
+        return None
+    return (bid + ask) / 2
+
+
+def _price_from_trade(data: Dict) -> Optional[float]:
+    """For trade data, use trade price"""
+    return data.get('price')
+
+
+def _mid_from_orderbook(data: Dict) -> Optional[float]:
+    """For orderbook data, use mid price from top of book"""
+    bid_px = data.get('bid_px')
+    if bid_px is not None:
+        ask_px = data.get('ask_px')
+        if ask_px is None or not len(bid_px) or not len(ask_px):
+            return None
+        return float(bid_px[0] + ask_px[0]) / 2
+    
+    # Legacy list-of-levels layout
+    bids = data.get('bids')
+    asks = data.get('asks')
+    if not bids or not asks:
+        return None
+    return (bids[0]['price'] + asks[0]['price']) / 2
+
+
+def _close_from_bar(data: Dict) -> Optional[float]:
+    """For bar data, use close price"""
+    return data.get('close')
+
+
+# Price extraction for each market data type that can revalue a position
+_PRICE_EXTRACTORS: Dict[MarketDataType, Callable[[Dict], Optional[float]]] = {
+    MarketDataType.QUOTE: _mid_from_quote,
+    MarketDataType.TRADE: _price_from_trade,
+    MarketDataType.ORDERBOOK: _mid_from_orderbook,
+    MarketDataType.BAR: _close_from_bar,
+}
+
+
 class PositionManager:
     def __init__(self, event_processor):
         self.positions: Dict[str, Position] = {}  # instrument_id -> Position
         self.event_processor = event_processor
         
+        # Column copies of the numeric position fields (row per instrument) so that
+        # portfolio totals are array reductions instead of loops over Position objects
+        # Rows double as dense integer ids: hot paths resolve instrument_id -> row
+        # once and index the lists and arrays by row from then on
+        self._rows: Dict[str, int] = {}  # instrument_id -> row in the arrays below
+        self._positions_by_row: List[Position] = []
+        self._quantity = np.zeros(16, dtype=np.float64)
+        self._realized_pnl = np.zeros(16, dtype=np.float64)
+        self._unrealized_pnl = np.zeros(16, dtype=np.float64)
+        self._position_value = np.zeros(16, dtype=np.float64)
+        
+        # Number of long (1), short (-1) and flat (0) positions, kept current on each trade
+        self._side_counts: Dict[int, int] = {1: 0, -1: 0, 0: 0}
+        self._sides_by_row: List[int] = []  # side each row was last counted under
+        
+        # Gross exposure (|allocated quantity| * current price) per strategy, kept current
+        # as prices and allocations change; contributions are per (strategy_id, instrument_id)
+        self._strategy_exposure: Dict[str, float] = {}
+        self._exposure_contributions: Dict[Tuple[str, str], float] = {}
+        
         # Performance tracking
         self.position_updates_count = 0
         self.last_total_pnl = 0.0
@@ -25,20 +92,19 @@ class PositionManager:
     async def _handle_trade_update(self, event: Event):
         """Process trade update events to update positions"""
         trade = event.data
-        if not isinstance(trade, Trade):
-            logger.error(f"Invalid trade data in event: {event}")
-            return
         
         # Get or create position for this instrument
         instrument_id = trade.instrument_id
-        if instrument_id not in self.positions:
-            self.positions[instrument_id] = Position(instrument_id=instrument_id)
-        
-        position = self.positions[instrument_id]
+        row = self._rows.get(instrument_id)
+        if row is None:
+            row = self._add_position(instrument_id)
+        position = self._positions_by_row[row]
         
         # Apply the trade to update the position
         position.apply_trade(trade)
-        position.timestamp = datetime.utcnow()
+        position.timestamp_ns = time.time_ns()
+        self._track_side(row, position)
+        self._sync_row(row, position)
         
         # Track performance
         self.position_updates_count += 1
@@ -54,42 +120,34 @@ class PositionManager:
         """Process market data events to update position valuations"""
         market_data = event.data
         
+        # Only instruments we hold a position in need revaluing
+        row = self._rows.get(market_data.instrument_id)
+        if row is None:
+            return
+        position = self._positions_by_row[row]
+        
         # Extract price information - structure depends on the type of market data
-        instrument_id = market_data.instrument_id
-        price = None
-        
-        # Try to extract price based on data type
-        if hasattr(market_data, 'data_type'):
-            data_type = market_data.data_type
-            if data_type.name == 'QUOTE':
-                # For quote data, use mid price
-                if 'bid' in market_data.data and 'ask' in market_data.data:
-                    price = (market_data.data['bid'] + market_data.data['ask']) / 2
-            elif data_type.name == 'TRADE':
-                # For trade data, use trade price
-                if 'price' in market_data.data:
-                    price = market_data.data['price']
-            elif data_type.name == 'ORDERBOOK':
-                # For orderbook data, use mid price from top of book
-                if 'bids' in market_data.data and 'asks' in market_data.data:
-                    if market_data.data['bids'] and market_data.data['asks']:
-                        best_bid = market_data.data['bids'][0]['price']
-                        best_ask = market_data.data['asks'][0]['price']
-                        price = (best_bid + best_ask) / 2
-            elif data_type.name == 'BAR':
-                # For bar data, use close price
-                if 'close' in market_data.data:
-                    price = market_data.data['close']
-        
-        if price is None or instrument_id not in self.positions:
+        extractor = _PRICE_EXTRACTORS.get(market_data.data_type)
+        if extractor is None:
+            return
+        price = extractor(market_data.data)
+        if price is None:
+            return
+        
+        # A flat position has no P&L to revalue; just remember the mark and when it came
+        if position.quantity == 0:
+            position.current_price = price
+            position.timestamp_ns = time.time_ns()
+            if position.strategy_allocations:
+                self._update_strategy_exposure(position)
             return
         
-        position = self.positions[instrument_id]
         old_pnl = position.unrealized_pnl
         
         # Update position with new price
         position.update_price(price)
-        position.timestamp = datetime.utcnow()
+        position.timestamp_ns = time.time_ns()
+        self._sync_row(row, position)
         
         # Only publish significant PnL changes (to reduce event traffic)
         pnl_change = abs(position.unrealized_pnl - old_pnl)
@@ -100,11 +158,93 @@ class PositionManager:
                 source="position_manager"
             ))
     
+    def _add_position(self, instrument_id: str) -> int:
+        """Create a flat position for an instrument and return its row"""
+        row = len(self._rows)
+        if row == len(self._quantity):
+            # Grow all columns together, doubling capacity
+            capacity = 2 * row
+            for name in ("_quantity", "_realized_pnl", "_unrealized_pnl", "_position_value"):
+                column = np.zeros(capacity, dtype=np.float64)
+                column[:row] = getattr(self, name)
+                setattr(self, name, column)
+        
+        position = Position(instrument_id=instrument_id)
+        self.positions[instrument_id] = position
+        self._rows[instrument_id] = row
+        self._positions_by_row.append(position)
+        self._sides_by_row.append(0)
+        self._side_counts[0] += 1
+        self._sync_row(row, position)
+        return row
+    
+    def _sync_row(self, row: int, position: Position):
+        """Copy a position's numeric fields into its row of the column arrays"""
+        self._quantity[row] = position.quantity
+        self._realized_pnl[row] = position.realized_pnl
+        self._unrealized_pnl[row] = position.unrealized_pnl
+        self._position_value[row] = position.position_value
+        if position.strategy_allocations:
+            self._update_strategy_exposure(position)
+    
+    def _update_strategy_exposure(self, position: Position):
+        """Re-value a position's strategy allocations at its current price"""
+        price = position.current_price
+        contributions = self._exposure_contributions
+        exposure = self._strategy_exposure
+        for strategy_id, quantity in position.strategy_allocations.items():
+            key = (strategy_id, position.instrument_id)
+            value = abs(quantity * price) if price else 0.0
+            exposure[strategy_id] = exposure.get(strategy_id, 0.0) + value - contributions.get(key, 0.0)
+            contributions[key] = value
+    
+    def _track_side(self, row: int, position: Position):
+        """Move a position between the long/short/flat counts if its side changed"""
+        quantity = position.quantity
+        side = 1 if quantity > 0 else -1 if quantity < 0 else 0
+        previous = self._sides_by_row[row]
+        if previous == side:
+            return
+        self._side_counts[previous] -= 1
+        self._side_counts[side] += 1
+        self._sides_by_row[row] = side
+    
     def get_position(self, instrument_id: str) -> Position:
         """Get position for an instrument, creating a new one if it doesn't exist"""
-        if instrument_id not in self.positions:
-            self.positions[instrument_id] = Position(instrument_id=instrument_id)
-        return self.positions[instrument_id]
+        row = self._rows.get(instrument_id)
+        if row is None:
+            row = self._add_position(instrument_id)
+        return self._positions_by_row[row]
+    
+    def materialize_snapshot(self) -> Dict:
+        """
+        Copy the numeric state of every position into a self-contained snapshot
+        Runs without awaiting, so the copy is consistent; the result shares no
+        mutable state with the manager and can be serialized off the event loop
+        """
+        count = len(self._rows)
+        return {
+            "timestamp_ns": time.time_ns(),
+            "instrument_id": list(self._rows),
+            "quantity": self._quantity[:count].copy(),
+            "average_entry_price": np.fromiter(
+                (position.average_entry_price for position in self._positions_by_row), np.float64, count
+            ),
+            "realized_pnl": self._realized_pnl[:count].copy(),
+            "unrealized_pnl": self._unrealized_pnl[:count].copy(),
+            "position_value": self._position_value[:count].copy()
+        }
+    
+    def get_position_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get read-only (quantity, position_value, unrealized_pnl) arrays, one entry per position
+        The arrays are views of live state; copy them if they must outlive the current event
+        """
+        count = len(self._rows)
+        columns = (self._quantity[:count], self._position_value[:count], self._unrealized_pnl[:count])
+        for column in columns:
+            column.flags.writeable = False
+        return columns
     
     def get_all_positions(self) -> List[Position]:
         """Get all positions"""
@@ -112,12 +252,13 @@ class PositionManager:
     
     def get_net_position(self) -> float:
         """Get total position value across all instruments"""
-        return sum(position.position_value for position in self.positions.values())
+        return float(self._position_value[:len(self._rows)].sum())
     
     def get_pnl_summary(self) -> Dict:
         """Get P&L summary across all positions"""
-        realized_pnl = sum(position.realized_pnl for position in self.positions.values())
-        unrealized_pnl = sum(position.unrealized_pnl for position in self.positions.values())
+        count = len(self._rows)
+        realized_pnl = float(self._realized_pnl[:count].sum())
+        unrealized_pnl = float(self._unrealized_pnl[:count].sum())
         total_pnl = realized_pnl + unrealized_pnl
         
         return {
@@ -132,7 +273,8 @@ class PositionManager:
         old_pnl = position.unrealized_pnl
         
         position.update_price(price)
-        position.timestamp = datetime.utcnow()
+        position.timestamp_ns = time.time_ns()
+        self._sync_row(self._rows[instrument_id], position)
         
         # Publish position update event
         await self.event_processor.publish(Event(
@@ -147,6 +289,7 @@ class PositionManager:
         
         # Update strategy allocation
         position.strategy_allocations[strategy_id] = quantity
+        self._update_strategy_exposure(position)
         
         # Publish position update event
         await self.event_processor.publish(Event(
@@ -163,16 +306,24 @@ class PositionManager:
                 result[instrument_id] = position.strategy_allocations[strategy_id]
         return result
     
+    def get_strategy_exposure_value(self, strategy_id: str) -> float:
+        """Get the gross exposure of a strategy's allocations at current prices"""
+        return self._strategy_exposure.get(strategy_id, 0.0)
+    
     def get_position_statistics(self) -> Dict:
         """Get statistics about positions in the system"""
         pnl_summary = self.get_pnl_summary()
         
-        long_positions = sum(1 for p in self.positions.values() if p.quantity > 0)
-        short_positions = sum(1 for p in self.positions.values() if p.quantity < 0)
-        flat_positions = sum(1 for p in self.positions.values() if p.quantity == 0)
+        side_counts = self._side_counts
+        long_positions = side_counts[1]
+        short_positions = side_counts[-1]
+        flat_positions = side_counts[0]
         
-        largest_long = max((p.position_value for p in self.positions.values() if p.quantity > 0), default=0)
-        largest_short = min((p.position_value for p in self.positions.values() if p.quantity < 0), default=0)
+        count = len(self._rows)
+        quantity = self._quantity[:count]
+        position_value = self._position_value[:count]
+        largest_long = float(position_value[quantity > 0].max(initial=0.0))
+        largest_short = float(position_value[quantity < 0].min(initial=0.0))
         
         return {
             **pnl_summary,
@@ -1,43 +1,88 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional, Set, Callable, Awaitable, Tuple, Any
-from datetime import datetime, timedelta
-import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any
+from datetime import datetime
 import numpy as np
 
-from .data_structures import Order, Position, OrderSide, OrderType, Event, EventType
-from .order_manager import OrderManager
-from .data_structures import OrderStatus
+from .data_structures import Order, OrderSide, OrderStatus, Event, EventType, RiskCheckResult, ns_to_datetime
+from ._risk_kernels import drawdown_kernel
 
 logger = logging.getLogger(__name__)
 
 
 class RiskRule:
     """Base class for risk rules"""
+    __slots__ = ("name", "enabled", "violations", "last_check_time_ns")
+    
+    # Rules whose check_sync calls blocking APIs set this so they run on a worker thread
+    blocking: bool = False
+    # Rules that can fail at check time (e.g. external services) set this so errors are
+    # reported as failed checks; other rules validate their inputs once in validate()
+    fallible: bool = False
+    
     def __init__(self, name: str, enabled: bool = True):
         self.name = name
         self.enabled = enabled
         self.violations = 0
-        self.last_check_time = datetime.utcnow()
+        self.last_check_time_ns = time.time_ns()
+    
+    @property
+    def last_check_time(self) -> datetime:
+        return ns_to_datetime(self.last_check_time_ns)
+    
+    def validate(self):
+        """Raise ValueError if the rule cannot be checked safely"""
+        pass
     
     async def check(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
         """
         Check if the rule is violated
+        Override this only for rules that need to await I/O; CPU-only rules override check_sync
         Returns (passed, message)
         """
-        self.last_check_time = datetime.utcnow()
+        return self.check_sync(risk_manager, context)
+    
+    def check_sync(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Check if the rule is violated without yielding to the event loop
+        Returns (passed, message)
+        """
+        # All rules in one check share the timestamp taken when the check started
+        self.last_check_time_ns = context.get("now_ns") or time.time_ns()
         return True, "Rule passed"
 
 
 class PositionLimitRule(RiskRule):
     """Rule to enforce maximum position size"""
+    __slots__ = ("instrument_id", "_max_position", "_msg_order", "_msg_current")
+    
     def __init__(self, instrument_id: str, max_position: float, name: Optional[str] = None, enabled: bool = True):
         super().__init__(name or f"Position limit for {instrument_id}", enabled)
-        self.instrument_id = instrument_id
+        self.instrument_id = sys.intern(instrument_id)
         self.max_position = max_position
     
-    async def check(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
-        await super().check(risk_manager, context)
+    @property
+    def max_position(self) -> float:
+        return self._max_position
+    
+    @max_position.setter
+    def max_position(self, value: float):
+        # Violation messages only depend on the limit, so build them when it changes
+        self._max_position = value
+        self._msg_order = f"Order would exceed position limit of {value} for {self.instrument_id}"
+        self._msg_current = f" exceeds limit of {value} for {self.instrument_id}"
+    
+    def validate(self):
+        """Raise ValueError if the rule cannot be checked safely"""
+        if not math.isfinite(self._max_position):
+            raise ValueError(f"{self.name}: max_position must be a finite number")
+    
+    def check_sync(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
+        super().check_sync(risk_manager, context)
         
         # Check if this applies to the current order
         order = context.get('order')
@@ -56,76 +101,99 @@ class PositionLimitRule(RiskRule):
             else:
                 new_position = abs(position.quantity - order.quantity)
             
-            if new_position > self.max_position:
+            if new_position > self._max_position:
                 self.violations += 1
-                return False, f"Order would exceed position limit of {self.max_position} for {self.instrument_id}"
+                return False, self._msg_order
         
         # For position checks, just check current position
-        elif current_position > self.max_position:
+        elif current_position > self._max_position:
             self.violations += 1
-            return False, f"Current position of {current_position} exceeds limit of {self.max_position} for {self.instrument_id}"
+            return False, f"Current position of {current_position}{self._msg_current}"
         
         return True, "Position within limits"
 
 
 class DrawdownLimitRule(RiskRule):
     """Rule to enforce maximum drawdown"""
+    __slots__ = ("_max_drawdown_pct", "window_days", "peak_value", "_msg_breached")
+    
     def __init__(self, max_drawdown_pct: float, window_days: int = 1, name: Optional[str] = None, enabled: bool = True):
         super().__init__(name or f"Drawdown limit of {max_drawdown_pct}%", enabled)
         self.max_drawdown_pct = max_drawdown_pct
         self.window_days = window_days
         self.peak_value = None
     
-    async def check(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
-        await super().check(risk_manager, context)
+    @property
+    def max_drawdown_pct(self) -> float:
+        return self._max_drawdown_pct
+    
+    @max_drawdown_pct.setter
+    def max_drawdown_pct(self, value: float):
+        self._max_drawdown_pct = value
+        self._msg_breached = f"% exceeds limit of {value}%"
+    
+    def validate(self):
+        """Raise ValueError if the rule cannot be checked safely"""
+        if not math.isfinite(self._max_drawdown_pct):
+            raise ValueError(f"{self.name}: max_drawdown_pct must be a finite number")
+    
+    def check_sync(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
+        super().check_sync(risk_manager, context)
         
         # Get current portfolio value
         pnl_summary = risk_manager.position_manager.get_pnl_summary()
         current_value = pnl_summary["realized_pnl"] + pnl_summary["unrealized_pnl"]
         
-        # Initialize peak if not set
-        if self.peak_value is None:
-            self.peak_value = current_value
-        elif current_value > self.peak_value:
-            self.peak_value = current_value
+        # Update the peak (initialized to the first value seen) and calculate drawdown
+        peak_value = current_value if self.peak_value is None else self.peak_value
+        self.peak_value, drawdown_pct, breached = drawdown_kernel(
+            float(peak_value), float(current_value), float(self._max_drawdown_pct)
+        )
         
-        # Calculate drawdown
         if self.peak_value <= 0:
             return True, "No peak value established yet"
         
-        drawdown_pct = (self.peak_value - current_value) / abs(self.peak_value) * 100
-        
-        if drawdown_pct > self.max_drawdown_pct:
+        if breached:
             self.violations += 1
-            return False, f"Current drawdown of {drawdown_pct:.2f}% exceeds limit of {self.max_drawdown_pct}%"
+            return False, f"Current drawdown of {drawdown_pct:.2f}{self._msg_breached}"
         
         return True, f"Current drawdown of {drawdown_pct:.2f}% within limits"
 
 
 class ExposureByStrategyRule(RiskRule):
     """Rule to limit exposure by strategy"""
+    __slots__ = ("strategy_id", "_max_exposure", "_msg_order", "_msg_current")
+    
     def __init__(self, strategy_id: str, max_exposure: float, name: Optional[str] = None, enabled: bool = True):
         super().__init__(name or f"Exposure limit for strategy {strategy_id}", enabled)
-        self.strategy_id = strategy_id
+        self.strategy_id = sys.intern(strategy_id)
         self.max_exposure = max_exposure
     
-    async def check(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
-        await super().check(risk_manager, context)
+    @property
+    def max_exposure(self) -> float:
+        return self._max_exposure
+    
+    @max_exposure.setter
+    def max_exposure(self, value: float):
+        self._max_exposure = value
+        self._msg_order = f"Order would exceed exposure limit of {value} for strategy {self.strategy_id}"
+        self._msg_current = f" exceeds limit of {value} for strategy {self.strategy_id}"
+    
+    def validate(self):
+        """Raise ValueError if the rule cannot be checked safely"""
+        if not math.isfinite(self._max_exposure):
+            raise ValueError(f"{self.name}: max_exposure must be a finite number")
+    
+    def check_sync(self, risk_manager: 'RiskManager', context: Dict[str, Any]) -> Tuple[bool, str]:
+        super().check_sync(risk_manager, context)
         
         # Check if this applies to the current order
         order = context.get('order')
         if order and order.strategy_id != self.strategy_id:
             return True, "Rule not applicable to this strategy"
         
-        # Calculate strategy exposure
-        strategy_positions = risk_manager.position_manager.get_strategy_exposure(self.strategy_id)
-        total_exposure = 0.0
-        
-        for instrument_id, quantity in strategy_positions.items():
-            position = risk_manager.position_manager.get_position(instrument_id)
-            if position.current_price:
-                exposure = abs(quantity * position.current_price)
-                total_exposure += exposure
+        # Strategy exposure is maintained incrementally by the position manager
+        total_exposure = risk_manager.position_manager.get_strategy_exposure_value(self.strategy_id)
         
         # For new orders, add potential exposure
         if order and order.strategy_id == self.strategy_id:
@@ -138,18 +206,23 @@ class ExposureByStrategyRule(RiskRule):
             additional_exposure = order.quantity * price
             new_exposure = total_exposure + additional_exposure
             
-            if new_exposure > self.max_exposure:
+            if new_exposure > self._max_exposure:
                 self.violations += 1
-                return False, f"Order would exceed exposure limit of {self.max_exposure} for strategy {self.strategy_id}"
+                return False, self._msg_order
         
         # For position checks, just check current exposure
-        elif total_exposure > self.max_exposure:
+        elif total_exposure > self._max_exposure:
             self.violations += 1
-            return False, f"Current exposure of {total_exposure} exceeds limit of {self.max_exposure} for strategy {self.strategy_id}"
+            return False, f"Current exposure of {total_exposure}{self._msg_current}"
         
         return True, f"Strategy exposure of {total_exposure} within limits"
 
 
+# Result placeholder for a rule that missed the check deadline; a private sentinel so
+# a TimeoutError raised by the rule itself is still reported as a rule error
+_DEADLINE_EXPIRED = object()
+
+
 class RiskManager:
     def __init__(self, event_processor, order_manager, position_manager, config=None):
         self.event_processor = event_processor
@@ -158,6 +231,13 @@ class RiskManager:
         
         # Risk rules
         self.rules: Dict[str, RiskRule] = {}
+        # (name, rule) pairs for enabled rules, rebuilt whenever rules change
+        self._enabled_rules: List[Tuple[str, RiskRule]] = []
+        # Enabled rules split by what they apply to, so order checks skip rules
+        # for other instruments and strategies
+        self._global_rules: List[Tuple[str, RiskRule]] = []
+        self._position_rules_by_instrument: Dict[str, List[Tuple[str, RiskRule]]] = {}
+        self._exposure_rules_by_strategy: Dict[str, List[Tuple[str, RiskRule]]] = {}
         
         # Risk limits from config
         self.config = config or {}
@@ -166,6 +246,23 @@ class RiskManager:
         # Periodic check task
         self.periodic_check_task = None
         self.check_interval_seconds = 60  # Default to checking every minute
+        # The interval adapts to the violation rate: it halves after a failed check and
+        # grows by a step after a run of consecutive passes, within these bounds
+        self.min_check_interval_seconds = 1
+        self.max_check_interval_seconds = 300
+        self.check_interval_step_seconds = 5
+        self.passes_before_backoff = 10
+        self._consecutive_passes = 0
+        
+        # Worker threads for blocking rules, capped so they cannot exhaust the pool;
+        # both are created by the first blocking check
+        self._blocking_workers = int(self.config.get("blocking_rule_workers", 8))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._blocking_semaphore: Optional[asyncio.Semaphore] = None
+        
+        # Deadline for blocking and async rules in one check; late rules count as failed
+        self.rule_timeout_seconds = float(self.config.get("rule_timeout_ms", 500)) / 1000
+        self.timeouts_total = 0
         
         # Register for events
         self.event_processor.add_handler(EventType.ORDER_UPDATE, self._handle_order_update)
@@ -195,53 +292,107 @@ class RiskManager:
                 self.add_rule(rule)
     
     def add_rule(self, rule: RiskRule):
-        """Add a risk rule"""
+        """
+        Add a risk rule
+        Raises ValueError if the rule fails validation
+        """
+        rule.validate()
         self.rules[rule.name] = rule
+        self._rebuild_enabled_rules()
     
     def remove_rule(self, rule_name: str) -> bool:
         """Remove a risk rule"""
         if rule_name in self.rules:
             del self.rules[rule_name]
+            self._rebuild_enabled_rules()
             return True
         return False
     
+    def set_rule_enabled(self, rule_name: str, enabled: bool) -> bool:
+        """
+        Enable or disable a risk rule
+        Use this rather than setting rule.enabled directly so the enabled rule cache stays current
+        """
+        rule = self.rules.get(rule_name)
+        if rule is None:
+            return False
+        rule.enabled = enabled
+        self._rebuild_enabled_rules()
+        return True
+    
+    def _rebuild_enabled_rules(self):
+        """Refresh the cached list of enabled rules and its per-order indexes"""
+        self._enabled_rules = [(rule_name, rule) for rule_name, rule in self.rules.items() if rule.enabled]
+        
+        global_rules = []
+        by_instrument: Dict[str, List[Tuple[str, RiskRule]]] = {}
+        by_strategy: Dict[str, List[Tuple[str, RiskRule]]] = {}
+        for entry in self._enabled_rules:
+            rule = entry[1]
+            if isinstance(rule, PositionLimitRule):
+                by_instrument.setdefault(rule.instrument_id, []).append(entry)
+            elif isinstance(rule, ExposureByStrategyRule):
+                by_strategy.setdefault(rule.strategy_id, []).append(entry)
+            else:
+                global_rules.append(entry)
+        
+        self._global_rules = global_rules
+        self._position_rules_by_instrument = by_instrument
+        self._exposure_rules_by_strategy = by_strategy
+        
+        # Plain position limits are evaluated together in periodic checks; subclasses
+        # may override check() so they run individually with the other rules
+        self._vector_position_rules = [
+            entry for entry in self._enabled_rules if type(entry[1]) is PositionLimitRule
+        ]
+        self._scalar_rules = [
+            entry for entry in self._enabled_rules if type(entry[1]) is not PositionLimitRule
+        ]
+    
     async def _handle_order_update(self, event: Event):
         """Process order update events"""
         order = event.data
         
         # Only check new orders
-        if order.status != OrderStatus.PENDING_NEW:
+        if order.status is not OrderStatus.PENDING_NEW:
             return
         
-        # Check risk rules for this order
-        context = {"order": order, "event_type": "order"}
-        passed, messages = await self.check_rules(context)
+        # Check risk rules for this order; a rule that raises fails the check,
+        # so the order is rejected rather than left pending
+        try:
+            passed, messages = await self.check_rules_for_order(order)
+        except Exception as e:
+            logger.exception("Error checking risk rules for order %s: %s", order.order_id, e)
+            passed, messages = False, [f"Error during check - {e}"]
         
         if not passed:
             # Reject the order
+            now_ns = time.time_ns()
             order.status = OrderStatus.REJECTED
-            order.updated_at = datetime.utcnow()
+            order.updated_at_ns = now_ns
             
-            logger.warning(f"Order {order.order_id} rejected due to risk check failure: {', '.join(messages)}")
+            logger.warning("Order %s rejected due to risk check failure: %s", order.order_id, ", ".join(messages))
             
-            # Publish order update with rejection
-            await self.event_processor.publish(Event(
-                event_type=EventType.ORDER_UPDATE,
-                data=order,
-                source="risk_manager"
-            ))
-            
-            # Also publish risk event
-            await self.event_processor.publish(Event(
-                event_type=EventType.RISK_CHECK,
-                data={
-                    "passed": False,
-                    "order_id": order.order_id,
-                    "messages": messages,
-                    "timestamp": datetime.utcnow()
-                },
-                source="risk_manager"
-            ))
+            # Publish the rejected order (the order manager tracks state from it)
+            # together with the risk event, in one batch
+            self.event_processor.publish_many([
+                Event(
+                    event_type=EventType.ORDER_UPDATE,
+                    data=order,
+                    source="risk_manager"
+                ),
+                Event(
+                    event_type=EventType.RISK_CHECK,
+                    data=RiskCheckResult(
+                        passed=False,
+                        messages=tuple(messages),
+                        check_type="order",
+                        order_id=order.order_id,
+                        timestamp_ns=now_ns
+                    ),
+                    source="risk_manager"
+                )
+            ])
     
     async def _handle_position_update(self, event: Event):
         """Process position update events"""
@@ -256,25 +407,153 @@ class RiskManager:
         Check all enabled risk rules
         Returns (all_passed, error_messages)
         """
+        # The cached list is replaced (not mutated) on changes, so names and results stay aligned
+        if context.get('order') is not None:
+            return await self._run_rules(self._enabled_rules, context)
+        
+        # Without an order, position limits reduce to one array comparison
+        context["now_ns"] = time.time_ns()
+        position_passed, messages = self._vec_position_check(context["now_ns"])
+        passed, other_messages = await self._run_rules(self._scalar_rules, context)
+        messages.extend(other_messages)
+        return position_passed and passed, messages
+    
+    def _vec_position_check(self, now_ns: int) -> Tuple[bool, List[str]]:
+        """
+        Check every plain PositionLimitRule against the current positions in one pass
+        Returns (all_passed, error_messages)
+        """
+        rules = self._vector_position_rules
+        if not rules:
+            return True, []
+        
+        get_position = self.position_manager.get_position
+        count = len(rules)
+        limits = np.fromiter((rule.max_position for _, rule in rules), np.float64, count)
+        qty = np.fromiter((abs(get_position(rule.instrument_id).quantity) for _, rule in rules), np.float64, count)
+        
+        for _, rule in rules:
+            rule.last_check_time_ns = now_ns
+        
+        messages = []
+        for i in np.flatnonzero(qty > limits):
+            rule_name, rule = rules[i]
+            rule.violations += 1
+            messages.append(f"{rule_name}: Current position of {qty[i]}{rule._msg_current}")
+        return not messages, messages
+    
+    async def check_rules_for_order(self, order: Order) -> Tuple[bool, List[str]]:
+        """
+        Check the enabled risk rules that can apply to an order
+        Position and strategy exposure rules for other instruments or strategies are skipped
+        Returns (all_passed, error_messages)
+        """
+        rules = (
+            self._global_rules
+            + self._position_rules_by_instrument.get(order.instrument_id, [])
+            + self._exposure_rules_by_strategy.get(order.strategy_id, [])
+        )
+        context = {"order": order, "event_type": "order"}
+        return await self._run_rules(rules, context)
+    
+    async def _run_rules(self, rules: List[Tuple[str, RiskRule]], context: Dict[str, Any]) -> Tuple[bool, List[str]]:
+        """
+        Run the given (name, rule) checks and collect failures
+        Rules without an async check override run inline, blocking rules run on worker
+        threads, and the rest are awaited concurrently
+        """
         all_passed = True
         messages = []
-        
-        for rule_name, rule in self.rules.items():
-            if not rule.enabled:
+        context.setdefault("now_ns", time.time_ns())
+        
+        # Run the inline rules before creating any coroutine, so an error propagating
+        # from one of them can't leave coroutines that are never awaited
+        results: List[Any] = []
+        deferred = []  # indexes into results of blocking and async rules
+        for _, rule in rules:
+            if rule.blocking or type(rule).check is not RiskRule.check:
+                deferred.append(len(results))
+                results.append(None)
+            elif not rule.fallible:
+                # Only fallible rules pay for exception handling; errors in the others
+                # are programming errors and propagate
+                results.append(rule.check_sync(self, context))
+            else:
+                try:
+                    results.append(rule.check_sync(self, context))
+                except Exception as e:
+                    results.append(e)
+        
+        if deferred:
+            pending = []  # (index into results, coroutine)
+            for index in deferred:
+                rule = rules[index][1]
+                if rule.blocking:
+                    pending.append((index, self._run_blocking_rule(rule, context)))
+                else:
+                    pending.append((index, rule.check(self, context)))
+            
+            tasks = [asyncio.ensure_future(coro) for _, coro in pending]
+            _, late = await asyncio.wait(tasks, timeout=self.rule_timeout_seconds)
+            for (index, _), task in zip(pending, tasks):
+                if task in late:
+                    task.cancel()
+                    self.timeouts_total += 1
+                    results[index] = _DEADLINE_EXPIRED
+                    continue
+                exception = task.exception()
+                results[index] = exception if exception is not None else task.result()
+        
+        for (rule_name, _), result in zip(rules, results):
+            if result is _DEADLINE_EXPIRED:
+                logger.warning("Risk rule %s timed out after %ss", rule_name, self.rule_timeout_seconds)
+                all_passed = False
+                messages.append(f"{rule_name}: timeout")
                 continue
-                
-            try:
-                passed, message = await rule.check(self, context)
-                if not passed:
-                    all_passed = False
-                    messages.append(f"{rule_name}: {message}")
-            except Exception as e:
-                logger.exception(f"Error checking risk rule {rule_name}: {e}")
+            
+            if isinstance(result, Exception):
+                logger.error("Error checking risk rule %s: %s", rule_name, result, exc_info=result)
+                all_passed = False
+                messages.append(f"{rule_name}: Error during check - {str(result)}")
+                continue
+            
+            passed, message = result
+            if not passed:
                 all_passed = False
-                messages.append(f"{rule_name}: Error during check - {str(e)}")
+                messages.append(f"{rule_name}: {message}")
         
         return all_passed, messages
     
+    async def _run_blocking_rule(self, rule: RiskRule, context: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Run a blocking rule's check_sync on the worker pool
+        The semaphore slot is held until the worker thread finishes, not just until
+        the check is abandoned at its deadline, so late checks can't oversubscribe the pool
+        """
+        semaphore = self._blocking_semaphore
+        if semaphore is None:
+            semaphore = self._blocking_semaphore = asyncio.Semaphore(self._blocking_workers)
+        await semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._blocking_workers, thread_name_prefix="risk-rule"
+                )
+            work = self._executor.submit(rule.check_sync, self, context)
+        except BaseException:
+            semaphore.release()
+            raise
+        
+        def release_slot(_):
+            try:
+                loop.call_soon_threadsafe(semaphore.release)
+            except RuntimeError:
+                pass  # The loop has closed; nothing is waiting on the slot
+        
+        work.add_done_callback(release_slot)
+        return await asyncio.wrap_future(work, loop=loop)
+    
     async def start_periodic_checks(self):
         """Start periodic risk checks"""
         self.periodic_check_task = asyncio.create_task(self._periodic_check_loop())
@@ -288,36 +567,62 @@ class RiskManager:
             except asyncio.CancelledError:
                 pass
             self.periodic_check_task = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
     async def _periodic_check_loop(self):
         """Background task to periodically check risk rules"""
         try:
             while True:
-                await self._perform_periodic_check()
+                # A failing check is logged and counted as failed; it must not end the loop
+                try:
+                    passed = await self._perform_periodic_check()
+                except Exception as e:
+                    logger.exception("Error in periodic risk check: %s", e)
+                    passed = False
+                self._adapt_check_interval(passed)
                 await asyncio.sleep(self.check_interval_seconds)
         except asyncio.CancelledError:
             logger.info("Periodic risk check task cancelled")
             raise
         except Exception as e:
-            logger.exception(f"Error in periodic risk check: {e}")
+            logger.exception("Error in periodic risk check: %s", e)
     
-    async def _perform_periodic_check(self):
-        """Perform a comprehensive risk check"""
+    def _adapt_check_interval(self, passed: bool):
+        """Check more often while rules are failing and back off while they keep passing"""
+        if not passed:
+            self._consecutive_passes = 0
+            self.check_interval_seconds = max(self.min_check_interval_seconds, self.check_interval_seconds / 2)
+            return
+        
+        self._consecutive_passes += 1
+        if self._consecutive_passes >= self.passes_before_backoff:
+            self._consecutive_passes = 0
+            self.check_interval_seconds = min(
+                self.max_check_interval_seconds, self.check_interval_seconds + self.check_interval_step_seconds
+            )
+    
+    async def _perform_periodic_check(self) -> bool:
+        """
+        Perform a comprehensive risk check
+        Returns True if all rules passed
+        """
         context = {"event_type": "periodic"}
         passed, messages = await self.check_rules(context)
         
         if not passed:
-            logger.warning(f"Periodic risk check failed: {', '.join(messages)}")
+            logger.warning("Periodic risk check failed: %s", ", ".join(messages))
             
             # Publish risk event
             await self.event_processor.publish(Event(
                 event_type=EventType.RISK_CHECK,
-                data={
-                    "passed": False,
-                    "messages": messages,
-                    "timestamp": datetime.utcnow(),
-                    "check_type": "periodic"
-                },
+                data=RiskCheckResult(
+                    passed=False,
+                    messages=tuple(messages),
+                    check_type="periodic"
+                ),
                 source="risk_manager"
             ))
             
@@ -325,6 +630,8 @@ class RiskManager:
             # - Cancel open orders
             # - Reduce positions
             # - Notify administrators
+        
+        return passed
     
     def get_rule_status(self) -> List[Dict]:
         """Get the status of all risk rules"""
@@ -341,18 +648,17 @@ class RiskManager:
     
     def get_risk_summary(self) -> Dict:
         """Get a summary of the current risk state"""
-        # Get position data
-        positions = self.position_manager.get_all_positions()
+        # Get position data as columns
+        quantity, position_value, unrealized_pnl = self.position_manager.get_position_columns()
         
         # Calculate various risk metrics
-        gross_exposure = sum(abs(p.position_value) for p in positions)
-        net_exposure = sum(p.position_value for p in positions)
-        long_exposure = sum(p.position_value for p in positions if p.quantity > 0)
-        short_exposure = sum(p.position_value for p in positions if p.quantity < 0)
+        gross_exposure = float(np.abs(position_value).sum())
+        net_exposure = float(position_value.sum())
+        long_exposure = float(position_value[quantity > 0].sum())
+        short_exposure = float(position_value[quantity < 0].sum())
         
         # Calculate some basic portfolio statistics
-        pnl_values = [p.unrealized_pnl for p in positions]
-        pnl_std = np.std(pnl_values) if pnl_values else 0
+        pnl_std = float(unrealized_pnl.std()) if unrealized_pnl.size else 0.0
         
         return {
             "gross_exposure": gross_exposure,
@@ -362,6 +668,7 @@ class RiskManager:
             "long_short_ratio": long_exposure / abs(short_exposure) if short_exposure else float('inf'),
             "pnl_volatility": pnl_std,
             "rule_violations": sum(rule.violations for rule in self.rules.values()),
-            "active_rules": sum(1 for rule in self.rules.values() if rule.enabled),
+            "active_rules": len(self._enabled_rules),
+            "rule_timeouts": self.timeouts_total,
             "timestamp": datetime.utcnow().isoformat()
         }
\ No newline at end of file
@@ -1,33 +1,119 @@
 import asyncio
 import logging
+import sys
 import time
-import yaml
+import functools
+import hashlib
 import os
-from typing import Dict, List, Optional, Any, Set, Callable
+from typing import Dict, List, Optional, Any, Set, Callable, Awaitable
 from datetime import datetime
-import signal
 import json
 
-from .data_structures import Event, EventType, Order, Trade, Position, MarketData
+from .data_structures import Event, EventType, Order, OrderStatus, Trade, Position, MarketData, to_json, ns_to_datetime
 from .order_manager import OrderManager
 from .position_manager import PositionManager
 from .risk_manager import RiskManager
 from .event_processor import EventProcessor
+from .heartbeat_ring import HeartbeatRing
+from utils.logging_utils import configure_logging
 
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+# (whole second, its ISO text) of the last timestamp formatted by _ns_to_iso
+_iso_cache = [-1, ""]
+
+
+def _ns_to_iso(timestamp_ns: int) -> str:
+    """Format nanoseconds since the epoch as a naive UTC ISO timestamp, reusing the formatted second"""
+    sec, ns = divmod(timestamp_ns, 1_000_000_000)
+    if sec != _iso_cache[0]:
+        _iso_cache[0] = sec
+        _iso_cache[1] = ns_to_datetime(sec * 1_000_000_000).isoformat()
+    return f"{_iso_cache[1]}.{ns // 1000:06d}"
+
+
+def _now_iso() -> str:
+    """Current time as a naive UTC ISO timestamp"""
+    return _ns_to_iso(time.time_ns())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_yaml():
+    """Import PyYAML on first use; only config loading needs it"""
+    import yaml
+    return yaml
+
+
+def _config_cache_path(config_path: str) -> str:
+    """Location of the parsed-config cache for a config file, outside the config directory"""
+    cache_root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    key = hashlib.sha1(os.path.realpath(config_path).encode()).hexdigest()
+    return os.path.join(cache_root, "trading_engine", f"config-{key}.json")
+
+
+def _read_config(config_path: str) -> Dict:
+    """
+    Parse a YAML config file, reusing a JSON cache of the result while the file is unchanged
+    The cache records the file's mtime and size and is only used when both match exactly;
+    it is only written when the config survives a JSON round trip unchanged
+    """
+    cache_path = _config_cache_path(config_path)
+    config_stat = os.stat(config_path)
+    source = {"mtime_ns": config_stat.st_mtime_ns, "size": config_stat.st_size}
+    try:
+        with open(cache_path, 'r') as file:
+            cached = json.load(file)
+        if cached.get("source") == source:
+            return cached["config"]
+    except (OSError, ValueError, AttributeError, KeyError):
+        pass
+    
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    yaml = _get_yaml()
+    with open(config_path, 'r') as file:
+        config = yaml.load(file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    
+    try:
+        if json.loads(json.dumps(config)) == config:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as file:
+                json.dump({"source": source, "config": config}, file)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.debug("Not caching configuration from %s: %s", config_path, e)
+    return config
+
+
+def _write_snapshot(snapshot: Dict, path: str):
+    """Serialize a snapshot and atomically replace the file at path"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(to_json(snapshot))
+    os.replace(tmp_path, path)
+
 
 class TradingEngine:
     def __init__(self, config_path: str):
         """Initialize the trading engine with the specified configuration"""
         self.config = self._load_config(config_path)
-        self.name = self.config.get("engine_name", "TradingEngine")
-        self.instance_id = self.config.get("instance_id", "main")
+        self._config_public = {k: v for k, v in self.config.items() if k != "api_keys"}  # Don't log sensitive data
+        self.name = sys.intern(str(self.config.get("engine_name", "TradingEngine")))
+        self.instance_id = sys.intern(str(self.config.get("instance_id", "main")))
         
         # Set up logging
         self._configure_logging()
         
+        # Builders for the engine's own system events, with the identity fields bound once
+        self._startup_event = self._make_system_event_builder("startup")
+        self._shutdown_event = self._make_system_event_builder("shutdown")
+        self._heartbeat_event = self._make_system_event_builder("heartbeat", priority=3)  # Lower priority for heartbeats
+        self._status_event = self._make_system_event_builder("status")
+        
         # Create event processor
         max_queue_size = self.config.get("event_queue_size", 100000)
         self.event_processor = EventProcessor(max_queue_size=max_queue_size)
@@ -49,30 +135,96 @@ class TradingEngine:
         self.running = False
         self.startup_time = None
         self.shutdown_time = None
-        self.last_heartbeat = None
+        self._startup_monotonic = None  # Uptime is measured on the monotonic clock
+        self.last_heartbeat_ns: Optional[int] = None
+        self._processor_task: Optional[asyncio.Task] = None  # Runs the event processor loop
+        self._background_task: Optional[asyncio.Task] = None  # Supervises heartbeat and snapshot tasks
+        # Set by request_shutdown() (e.g. from a signal handler); a waiter task started
+        # by start() then runs stop() on the next loop iteration
+        self._shutdown_requested = asyncio.Event()
+        self._shutdown_waiter: Optional[asyncio.Task] = None
         self.registered_data_sources = set()
         self.registered_strategies = {}
-        self.stats = {
-            "events_processed": 0,
-            "orders_submitted": 0,
-            "trades_executed": 0
-        }
+        # Status view of each registered strategy, built once at registration
+        self._strategy_public_view: Dict[str, Dict] = {}
+        # Statistics counters, bumped per event; read them through the stats property
+        self._events_processed = 0
+        self._orders_submitted = 0
+        self._trades_executed = 0
+        
+        # Shared-memory heartbeat ring for out-of-process monitors; created by
+        # start() when enabled and released by stop()
+        self.heartbeat_ring: Optional[HeartbeatRing] = None
+        self._heartbeat_ring_config = self.config.get("telemetry", {}).get("heartbeat_ring", {})
         
         # Additional components from config
         self.initialize_additional_components()
         
+        # SYSTEM_EVENT subtypes the engine responds to
+        self._system_event_dispatch: Dict[str, Callable[[], Awaitable[None]]] = {
+            "shutdown": self._handle_shutdown_request,
+            "heartbeat_request": self.send_heartbeat,  # Respond with heartbeat
+            "status_request": self.publish_status  # Respond with status
+        }
+        
         # Register for events
-        self.event_processor.add_handler(EventType.SYSTEM_EVENT, self._handle_system_event)
-        self.event_processor.add_handler(EventType.ORDER_UPDATE, self._handle_order_update)
-        self.event_processor.add_handler(EventType.TRADE_UPDATE, self._handle_trade_update)
+        self.event_processor.add_handlers({
+            EventType.SYSTEM_EVENT: self._handle_system_event,
+            EventType.ORDER_UPDATE: self._handle_order_update,
+            EventType.TRADE_UPDATE: self._handle_trade_update
+        })
         
         logger.info(f"Trading engine {self.name} initialized with instance ID {self.instance_id}")
     
+    @property
+    def last_heartbeat(self) -> Optional[datetime]:
+        if self.last_heartbeat_ns is None:
+            return None
+        return ns_to_datetime(self.last_heartbeat_ns)
+    
+    def _uptime_seconds(self) -> float:
+        """Seconds since start(), unaffected by wall clock adjustments"""
+        if self._startup_monotonic is None:
+            return 0
+        return time.monotonic() - self._startup_monotonic
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Engine statistics counters as a new dict"""
+        return {
+            "events_processed": self._events_processed,
+            "orders_submitted": self._orders_submitted,
+            "trades_executed": self._trades_executed
+        }
+    
+    def _make_system_event_builder(self, subtype: str, priority: int = 1) -> Callable[..., Event]:
+        """
+        Create a function that builds SYSTEM_EVENT events of one subtype
+        The builder takes the event timestamp plus the subtype's own fields
+        """
+        engine_name = self.name
+        instance_id = self.instance_id
+        
+        def build(timestamp: str, **fields) -> Event:
+            return Event(
+                event_type=EventType.SYSTEM_EVENT,
+                data={
+                    "type": subtype,
+                    "engine_name": engine_name,
+                    "instance_id": instance_id,
+                    "timestamp": timestamp,
+                    **fields
+                },
+                source="trading_engine",
+                priority=priority
+            )
+        
+        return build
+    
     def _load_config(self, config_path: str) -> Dict:
         """Load YAML configuration file"""
         try:
-            with open(config_path, 'r') as file:
-                return yaml.safe_load(file)
+            return _read_config(config_path)
         except Exception as e:
             logger.error(f"Failed to load configuration from {config_path}: {e}")
             # Return default configuration
@@ -86,23 +238,19 @@ class TradingEngine:
             }
     
     def _configure_logging(self):
-        """Configure logging based on settings in config"""
-        log_level = getattr(logging, self.config.get("log_level", "INFO"))
-        log_format = self.config.get("log_format", 
-                                    "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-        
-        # Configure root logger
-        logging.basicConfig(
-            level=log_level,
-            format=log_format
-        )
-        
-        # Configure file handler if specified
+        """
+        Configure logging based on settings in config
+        Records are written by configure_logging's listener thread, so console and
+        file I/O stay off the event loop; the process calls shutdown_logging() on exit
+        """
         log_file = self.config.get("log_file")
-        if log_file:
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setFormatter(logging.Formatter(log_format))
-            logging.getLogger().addHandler(file_handler)
+        configure_logging(
+            log_level=self.config.get("log_level", "INFO"),
+            log_format=self.config.get("log_format", _DEFAULT_LOG_FORMAT),
+            log_file=log_file,
+            log_to_console=True,
+            log_to_file=bool(log_file)
+        )
     
     def initialize_additional_components(self):
         """Initialize any additional components specified in config"""
@@ -114,27 +262,24 @@ class TradingEngine:
         if not isinstance(event.data, dict):
             return
         
-        event_subtype = event.data.get("type")
-        
-        if event_subtype == "shutdown":
-            logger.info("Received shutdown event, initiating shutdown...")
-            await self.stop()
-        elif event_subtype == "heartbeat_request":
-            # Respond with heartbeat
-            await self.send_heartbeat()
-        elif event_subtype == "status_request":
-            # Respond with status
-            await self.publish_status()
+        handler = self._system_event_dispatch.get(event.data.get("type"))
+        if handler is not None:
+            await handler()
+    
+    async def _handle_shutdown_request(self):
+        """Stop the engine in response to a shutdown event"""
+        logger.info("Received shutdown event, initiating shutdown...")
+        await self.stop()
     
     async def _handle_order_update(self, event: Event):
         """Track order update events for statistics"""
         order = event.data
-        if order.status.name == "PENDING_NEW":
-            self.stats["orders_submitted"] += 1
+        if order.status is OrderStatus.PENDING_NEW:
+            self._orders_submitted += 1
     
     async def _handle_trade_update(self, event: Event):
         """Track trade events for statistics"""
-        self.stats["trades_executed"] += 1
+        self._trades_executed += 1
     
     async def start(self):
         """Start the trading engine and all components"""
@@ -145,32 +290,39 @@ class TradingEngine:
         logger.info(f"Starting trading engine {self.name}...")
         self.running = True
         self.startup_time = datetime.utcnow()
+        self._startup_monotonic = time.monotonic()
+        self._shutdown_requested.clear()
+        self._open_heartbeat_ring()
+        self._shutdown_waiter = asyncio.create_task(self._await_shutdown())
         
-        # Start event processor
-        await self.event_processor.start()
+        # Start event processor; its loop runs until stop(), so it gets its own task
+        self._processor_task = asyncio.create_task(self.event_processor.start())
         
         # Start risk manager periodic checks
         await self.risk_manager.start_periodic_checks()
         
-        # Set up heartbeat task
-        heartbeat_interval = self.config.get("heartbeat_interval_seconds", 5)
-        self.heartbeat_task = asyncio.create_task(self._heartbeat_loop(heartbeat_interval))
+        # Set up heartbeat and position snapshot tasks
+        self._background_task = asyncio.create_task(self._run_background_tasks())
         
         # Publish startup event
-        await self.event_processor.publish(Event(
-            event_type=EventType.SYSTEM_EVENT,
-            data={
-                "type": "startup",
-                "engine_name": self.name,
-                "instance_id": self.instance_id,
-                "timestamp": self.startup_time.isoformat(),
-                "config": {k: v for k, v in self.config.items() if k != "api_keys"}  # Don't log sensitive data
-            },
-            source="trading_engine"
+        await self.event_processor.publish(self._startup_event(
+            self.startup_time.isoformat(),
+            config=self._config_public
         ))
         
         logger.info(f"Trading engine {self.name} started successfully")
     
+    def _open_heartbeat_ring(self):
+        """Create the shared-memory heartbeat ring if telemetry enables it"""
+        ring_config = self._heartbeat_ring_config
+        if not ring_config.get("enabled") or self.heartbeat_ring is not None:
+            return
+        self.heartbeat_ring = HeartbeatRing.create(
+            slots=ring_config.get("slots", 4096),
+            name=ring_config.get("name")
+        )
+        logger.info(f"Heartbeat ring available in shared memory as {self.heartbeat_ring.name}")
+    
     async def stop(self):
         """Stop the trading engine and all components"""
         if not self.running:
@@ -181,75 +333,141 @@ class TradingEngine:
         self.running = False
         self.shutdown_time = datetime.utcnow()
         
-        # Cancel heartbeat task
-        if hasattr(self, 'heartbeat_task'):
-            self.heartbeat_task.cancel()
+        # Cancel the shutdown waiter, unless it is the task running this stop()
+        waiter = self._shutdown_waiter
+        self._shutdown_waiter = None
+        if waiter is not None and waiter is not asyncio.current_task():
+            waiter.cancel()
+        
+        # Cancel heartbeat and snapshot tasks; cancelling the supervisor cancels both
+        if self._background_task is not None:
+            self._background_task.cancel()
             try:
-                await self.heartbeat_task
+                await self._background_task
             except asyncio.CancelledError:
                 pass
+            self._background_task = None
         
         # Stop risk manager
         await self.risk_manager.stop_periodic_checks()
         
         # Publish shutdown event
-        await self.event_processor.publish(Event(
-            event_type=EventType.SYSTEM_EVENT,
-            data={
-                "type": "shutdown",
-                "engine_name": self.name,
-                "instance_id": self.instance_id,
-                "timestamp": self.shutdown_time.isoformat(),
-                "uptime_seconds": (self.shutdown_time - self.startup_time).total_seconds(),
-                "stats": self.stats
-            },
-            source="trading_engine"
+        await self.event_processor.publish(self._shutdown_event(
+            self.shutdown_time.isoformat(),
+            uptime_seconds=self._uptime_seconds(),
+            stats=self.stats
         ))
         
         # Stop event processor (this should be last)
         await self.event_processor.stop()
+        # Wait for its loop to finish, unless stop() is running inside it (a shutdown event)
+        processor_task = self._processor_task
+        self._processor_task = None
+        if processor_task is not None and processor_task is not asyncio.current_task():
+            await processor_task
         
         logger.info(f"Trading engine {self.name} stopped successfully")
+        
+        # Release the heartbeat ring's shared memory
+        if self.heartbeat_ring is not None:
+            try:
+                self.heartbeat_ring.close()
+            except Exception as e:
+                logger.error(f"Error releasing heartbeat ring: {e}")
+            self.heartbeat_ring = None
+    
+    def request_shutdown(self):
+        """Ask a running engine to stop; safe to call from signal handlers on the loop"""
+        self._shutdown_requested.set()
+    
+    async def _await_shutdown(self):
+        """Stop the engine once a shutdown has been requested"""
+        await self._shutdown_requested.wait()
+        logger.info("Shutdown requested, initiating graceful shutdown...")
+        await self.stop()
+    
+    async def _run_background_tasks(self):
+        """
+        Run the heartbeat and position snapshot loops in one task group
+        Each loop logs and survives its own per-iteration errors, so a failure in
+        one does not cancel the other through the group
+        """
+        heartbeat_interval = self.config.get("heartbeat_interval_seconds", 5)
+        snapshot_config = self.config.get("data_storage", {}).get("position_snapshots", {})
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                task_group.create_task(self._heartbeat_loop(heartbeat_interval))
+                if snapshot_config.get("enabled"):
+                    task_group.create_task(self._snapshot_loop(
+                        snapshot_config.get("path", "logs/positions_snapshot.json"),
+                        snapshot_config.get("interval_seconds", 30)
+                    ))
+        except* Exception as errors:
+            for error in errors.exceptions:
+                logger.error(f"Background task failed: {error}", exc_info=error)
     
     async def _heartbeat_loop(self, interval_seconds: int):
         """Send periodic heartbeats to indicate the engine is running"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
         try:
             while self.running:
-                await self.send_heartbeat()
-                await asyncio.sleep(interval_seconds)
+                try:
+                    await self.send_heartbeat()
+                except Exception as e:
+                    logger.exception("Failed to send heartbeat: %s", e)
+                # Sleep to the next tick rather than a full interval so time spent
+                # sending does not accumulate as drift
+                deadline += interval_seconds
+                await asyncio.sleep(max(0.0, deadline - loop.time()))
         except asyncio.CancelledError:
             logger.debug("Heartbeat task cancelled")
             raise
     
+    async def _snapshot_loop(self, path: str, interval_seconds: float):
+        """Periodically write the position book to disk without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        try:
+            while self.running:
+                await asyncio.sleep(interval_seconds)
+                # Copy on the loop, serialize and write on a worker thread
+                try:
+                    snapshot = self.position_manager.materialize_snapshot()
+                    await loop.run_in_executor(None, _write_snapshot, snapshot, path)
+                except OSError as e:
+                    logger.error("Failed to write position snapshot to %s: %s", path, e)
+                except Exception as e:
+                    logger.exception("Failed to take position snapshot for %s: %s", path, e)
+        except asyncio.CancelledError:
+            logger.debug("Snapshot task cancelled")
+            raise
+    
     async def send_heartbeat(self):
         """Send a heartbeat event"""
-        self.last_heartbeat = datetime.utcnow()
-        
-        # Get basic status info
-        event_queue_size = self.event_processor.event_queue.qsize()
-        order_stats = self.order_manager.get_order_statistics()
-        position_stats = self.position_manager.get_position_statistics()
-        
-        await self.event_processor.publish(Event(
-            event_type=EventType.SYSTEM_EVENT,
-            data={
-                "type": "heartbeat",
-                "engine_name": self.name,
-                "instance_id": self.instance_id,
-                "timestamp": self.last_heartbeat.isoformat(),
-                "uptime_seconds": (self.last_heartbeat - self.startup_time).total_seconds() if self.startup_time else 0,
-                "event_queue_size": event_queue_size,
-                "active_orders": order_stats["active_orders"],
-                "positions_count": position_stats["position_count"]
-            },
-            source="trading_engine",
-            priority=3  # Lower priority for heartbeats
+        self.last_heartbeat_ns = time.time_ns()
+        
+        # Get basic status info; only counts are needed, so read them directly
+        # rather than building the full order and position statistics
+        uptime_seconds = self._uptime_seconds()
+        event_queue_size = self.event_processor.qsize()
+        active_orders = len(self.order_manager.active_orders)
+        positions_count = len(self.position_manager.positions)
+        
+        if self.heartbeat_ring is not None:
+            self.heartbeat_ring.write(
+                self.last_heartbeat_ns, uptime_seconds, event_queue_size, active_orders, positions_count
+            )
+        
+        await self.event_processor.publish(self._heartbeat_event(
+            _ns_to_iso(self.last_heartbeat_ns),
+            uptime_seconds=uptime_seconds,
+            event_queue_size=event_queue_size,
+            active_orders=active_orders,
+            positions_count=positions_count
         ))
     
     async def publish_status(self):
         """Publish a comprehensive status update"""
-        now = datetime.utcnow()
-        
         # Gather performance metrics
         event_metrics = self.event_processor.get_performance_metrics()
         order_stats = self.order_manager.get_order_statistics()
@@ -257,58 +475,81 @@ class TradingEngine:
         risk_summary = self.risk_manager.get_risk_summary()
         
         # Publish status event
-        await self.event_processor.publish(Event(
-            event_type=EventType.SYSTEM_EVENT,
-            data={
-                "type": "status",
-                "engine_name": self.name,
-                "instance_id": self.instance_id,
-                "timestamp": now.isoformat(),
-                "uptime_seconds": (now - self.startup_time).total_seconds() if self.startup_time else 0,
-                "performance": event_metrics,
-                "orders": order_stats,
-                "positions": position_stats,
-                "risk": risk_summary,
-                "stats": self.stats
-            },
-            source="trading_engine"
+        await self.event_processor.publish(self._status_event(
+            _now_iso(),
+            uptime_seconds=self._uptime_seconds(),
+            performance=event_metrics,
+            orders=order_stats,
+            positions=position_stats,
+            risk=risk_summary,
+            stats=self.stats
         ))
     
     async def register_data_source(self, source_id: str):
         """Register a market data source with the engine"""
+        # Publish registration event
+        await self.event_processor.publish(self._add_data_source(source_id))
+    
+    async def register_data_sources(self, source_ids: List[str]):
+        """Register several market data sources, publishing their events in one batch"""
+        queued = await self.event_processor.publish_batch([
+            self._add_data_source(source_id) for source_id in source_ids
+        ])
+        if queued < len(source_ids):
+            logger.warning("Dropped %d of %d data source registration events", len(source_ids) - queued, len(source_ids))
+    
+    def _add_data_source(self, source_id: str) -> Event:
+        """Record a data source and build its registration event"""
         self.registered_data_sources.add(source_id)
         logger.info(f"Registered data source: {source_id}")
         
-        # Publish registration event
-        await self.event_processor.publish(Event(
+        return Event(
             event_type=EventType.SYSTEM_EVENT,
             data={
                 "type": "data_source_registered",
                 "source_id": source_id,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _now_iso()
             },
             source="trading_engine"
-        ))
+        )
     
     async def register_strategy(self, strategy_id: str, strategy_info: Dict):
         """Register a trading strategy with the engine"""
+        # Publish registration event
+        await self.event_processor.publish(self._add_strategy(strategy_id, strategy_info))
+    
+    async def register_strategies(self, batch: Dict[str, Dict]):
+        """Register several strategies (strategy_id -> strategy_info), publishing their events in one batch"""
+        queued = await self.event_processor.publish_batch([
+            self._add_strategy(strategy_id, strategy_info) for strategy_id, strategy_info in batch.items()
+        ])
+        if queued < len(batch):
+            logger.warning("Dropped %d of %d strategy registration events", len(batch) - queued, len(batch))
+    
+    def _add_strategy(self, strategy_id: str, strategy_info: Dict) -> Event:
+        """Record a strategy and build its registration event"""
+        registered_at_ns = time.time_ns()
+        registered_at = ns_to_datetime(registered_at_ns)
         self.registered_strategies[strategy_id] = {
             "info": strategy_info,
-            "registered_at": datetime.utcnow()
+            "registered_at": registered_at
+        }
+        self._strategy_public_view[strategy_id] = {
+            "registered_at": _ns_to_iso(registered_at_ns),
+            **{k: v for k, v in strategy_info.items() if k != "parameters"}  # Don't include all parameters
         }
         logger.info(f"Registered strategy: {strategy_id}")
         
-        # Publish registration event
-        await self.event_processor.publish(Event(
+        return Event(
             event_type=EventType.SYSTEM_EVENT,
             data={
                 "type": "strategy_registered",
                 "strategy_id": strategy_id,
                 "strategy_info": strategy_info,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _ns_to_iso(registered_at_ns)
             },
             source="trading_engine"
-        ))
+        )
     
     async def process_market_data(self, market_data: MarketData):
         """Process incoming market data"""
@@ -320,6 +561,21 @@ class TradingEngine:
             sequence_id=market_data.sequence_id
         ))
     
+    async def process_market_data_batch(self, batch: List[MarketData]) -> int:
+        """
+        Process several market data updates, queuing them with one wake-up of the event loop
+        Returns the number of updates queued
+        """
+        return self.event_processor.publish_many([
+            Event(
+                event_type=EventType.MARKET_DATA,
+                data=market_data,
+                source=market_data.source,
+                sequence_id=market_data.sequence_id
+            )
+            for market_data in batch
+        ])
+    
     async def submit_order(self, order: Order, 
                           callback: Optional[Callable[[Order], Any]] = None) -> str:
         """Submit an order to the trading system"""
@@ -341,17 +597,15 @@ class TradingEngine:
     
     def get_engine_status(self) -> Dict:
         """Get a comprehensive status of the trading engine"""
-        now = datetime.utcnow()
-        
         # Basic status
         status = {
             "engine_name": self.name,
             "instance_id": self.instance_id,
             "running": self.running,
             "startup_time": self.startup_time.isoformat() if self.startup_time else None,
-            "current_time": now.isoformat(),
-            "uptime_seconds": (now - self.startup_time).total_seconds() if self.startup_time else 0,
-            "last_heartbeat": self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            "current_time": _now_iso(),
+            "uptime_seconds": self._uptime_seconds(),
+            "last_heartbeat": _ns_to_iso(self.last_heartbeat_ns) if self.last_heartbeat_ns else None,
         }
         
         # Component statuses
@@ -366,13 +620,7 @@ class TradingEngine:
         # Additional stats
         status["stats"] = self.stats
         status["data_sources"] = list(self.registered_data_sources)
-        status["strategies"] = {
-            sid: {
-                "registered_at": info["registered_at"].isoformat(),
-                **{k: v for k, v in info["info"].items() if k != "parameters"}  # Don't include all parameters
-            }
-            for sid, info in self.registered_strategies.items()
-        }
+        status["strategies"] = self._strategy_public_view
         
         return status
 
@@ -380,10 +628,11 @@ class TradingEngine:
 # Utility to handle signals for graceful shutdown
 def setup_signal_handlers(trading_engine, loop):
     """Set up signal handlers for graceful shutdown"""
+    import signal
     
     def signal_handler():
-        logger.info("Received shutdown signal, initiating graceful shutdown...")
-        asyncio.create_task(trading_engine.stop())
+        logger.info("Received shutdown signal")
+        trading_engine.request_shutdown()
     
     for signal_name in ('SIGINT', 'SIGTERM'):
         loop.add_signal_handler(
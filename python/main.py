@@ -1,16 +1,28 @@
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
 import os
 import signal
 import sys
+import time
 import yaml
-from datetime import datetime, timedelta
 import random
+from typing import Awaitable, Callable, List, Optional, Tuple
+import numpy as np
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from engine.trading_engine import TradingEngine, setup_signal_handlers
+from utils.logging_utils import configure_logging, shutdown_logging
+from engine._jit import njit, NUMBA_AVAILABLE
 from engine.data_structures import (
     MarketData, OrderBook, Order, Trade, OrderType, OrderSide, 
     OrderStatus, TimeInForce, EventType, Event, MarketDataType
@@ -18,6 +30,105 @@ from engine.data_structures import (
 
 logger = logging.getLogger(__name__)
 
+# Mock market data is handed to the engine in batches of up to this many ticks,
+# or whatever has accumulated once the flush delay has passed
+MARKET_DATA_BATCH_SIZE = 64
+MARKET_DATA_FLUSH_SECONDS = 0.005
+
+# The generator holds off while more than this many events wait in the engine's
+# queue, so a slow engine throttles it instead of dropping ticks
+MARKET_DATA_MAX_BACKLOG = 4096
+
+
+class _MockMarketDataDraws:
+    """
+    Random draws for the mock market data generator, made in bulk with NumPy
+    Scalar streams are kept as lists so that reading a draw is a plain list index;
+    call refill() once `size` ticks have been consumed
+    """
+    MAX_LEVELS = 15
+    
+    def __init__(self, instrument_count: int, size: int = 4096):
+        self.rng = np.random.default_rng()
+        self.instrument_count = instrument_count
+        self.size = size
+        self.refill()
+    
+    def refill(self):
+        rng = self.rng
+        size = self.size
+        self.instrument_idx = rng.integers(0, self.instrument_count, size).tolist()
+        self.price_change_pct = rng.normal(0, 0.0005, size).tolist()  # 0.05% standard deviation
+        # 0 = quote, 1 = orderbook, 2 = trade
+        self.data_type = rng.choice(3, size=size, p=[0.5, 0.3, 0.2]).tolist()
+        self.sleep_seconds = rng.uniform(0.001, 0.05, size).tolist()
+        
+        # Quotes
+        self.bid_spread = rng.uniform(0.0001, 0.001, size).tolist()  # 1-10 bps spread
+        self.ask_spread = rng.uniform(0.0001, 0.001, size).tolist()
+        self.bid_size = rng.uniform(0.1, 10, size).tolist()
+        self.ask_size = rng.uniform(0.1, 10, size).tolist()
+        
+        # Orderbooks: level counts and one row of per-level draws per tick
+        self.bid_count = rng.integers(5, self.MAX_LEVELS + 1, size).tolist()
+        self.ask_count = rng.integers(5, self.MAX_LEVELS + 1, size).tolist()
+        self.bid_level_delta = rng.uniform(0.0001, 0.005, (size, self.MAX_LEVELS))
+        self.ask_level_delta = rng.uniform(0.0001, 0.005, (size, self.MAX_LEVELS))
+        self.bid_level_size = rng.uniform(0.1, 20, (size, self.MAX_LEVELS))
+        self.ask_level_size = rng.uniform(0.1, 20, (size, self.MAX_LEVELS))
+        
+        # Trades
+        self.trade_noise = rng.normal(0, 0.0002, size).tolist()  # Slight noise
+        self.trade_size = rng.uniform(0.01, 5, size).tolist()
+        self.trade_is_buy = (rng.random(size) < 0.5).tolist()
+
+
+# Depth multipliers for orderbook levels: deeper levels sit further from mid
+# and carry less size
+_LEVEL_DEPTH = np.arange(1, _MockMarketDataDraws.MAX_LEVELS + 1, dtype=np.float64)
+_LEVEL_SIZE_SCALE = 1 / _LEVEL_DEPTH
+
+
+@njit(cache=True, fastmath=True)
+def _book_side_kernel(mid_price, deltas, sizes, sign):
+    """
+    Build one side of a mock orderbook, best price first
+    
+    Args:
+        mid_price: Price the levels are placed around
+        deltas: Fractional distance from mid for each level, before depth scaling
+        sizes: Size for each level, before depth scaling
+        sign: -1.0 for bids (below mid), 1.0 for asks (above mid)
+    
+    Returns:
+        (prices, sizes) arrays sorted by price, bids descending and asks ascending
+    """
+    count = deltas.shape[0]
+    prices = np.empty(count)
+    level_sizes = np.empty(count)
+    for level in range(count):
+        depth = level + 1.0
+        prices[level] = mid_price * (1.0 + sign * deltas[level] * depth)
+        level_sizes[level] = sizes[level] / depth
+    
+    # Stable insertion sort on sign * price; books are at most MAX_LEVELS deep
+    for level in range(1, count):
+        price = prices[level]
+        size = level_sizes[level]
+        j = level - 1
+        while j >= 0 and sign * prices[j] > sign * price:
+            prices[j + 1] = prices[j]
+            level_sizes[j + 1] = level_sizes[j]
+            j -= 1
+        prices[j + 1] = price
+        level_sizes[j + 1] = size
+    return prices, level_sizes
+
+
+if NUMBA_AVAILABLE:
+    # Compile (or load from cache) at import rather than on the first orderbook tick
+    _book_side_kernel(1.0, np.zeros(1), np.ones(1), 1.0)
+
 
 async def generate_mock_market_data(trading_engine, instruments, duration_seconds=300):
     """Generate mock market data for testing"""
@@ -37,20 +148,44 @@ async def generate_mock_market_data(trading_engine, instruments, duration_second
     # Keep track of sequence IDs
     sequence_ids = {instrument: 0 for instrument in instruments}
     
+    # Trade ids are a per-instrument counter behind a preformatted prefix
+    trade_counts = {instrument: 0 for instrument in instruments}
+    trade_id_prefixes = {instrument: f"mock_trade_{instrument}_" for instrument in instruments}
+    
     # Generate data for the specified duration
-    end_time = datetime.utcnow() + timedelta(seconds=duration_seconds)
+    end_time = time.monotonic() + duration_seconds
+    batch = []
+    flush_deadline = time.monotonic() + MARKET_DATA_FLUSH_SECONDS
+    next_wake = time.monotonic()  # Jittered batch schedule, advanced by each drawn sleep
+    
+    # Random draws are made in bulk and consumed one tick at a time
+    draws = _MockMarketDataDraws(len(instruments))
+    i = 0
+    
+    # Bind names used on every tick to locals
+    QUOTE = MarketDataType.QUOTE
+    TRADE = MarketDataType.TRADE
+    BUY = OrderSide.BUY
+    SELL = OrderSide.SELL
+    monotonic = time.monotonic
+    time_ns = time.time_ns
+    process_batch = trading_engine.process_market_data_batch
+    event_queue_size = trading_engine.event_processor.qsize
     
     try:
-        while datetime.utcnow() < end_time and trading_engine.running:
+        while monotonic() < end_time and trading_engine.running:
+            if i == draws.size:
+                draws.refill()
+                i = 0
+            
             # Select a random instrument
-            instrument = random.choice(instruments)
+            instrument = instruments[draws.instrument_idx[i]]
             
             # Get current price and update it
             current_price = base_prices[instrument]
             
             # Generate price movement (random walk with mean reversion)
-            price_change_pct = random.normalvariate(0, 0.0005)  # 0.05% standard deviation
-            new_price = current_price * (1 + price_change_pct)
+            new_price = current_price * (1 + draws.price_change_pct[i])
             
             # Add mean reversion
             reversion_strength = 0.05  # 5% reversion to starting price
@@ -63,59 +198,65 @@ async def generate_mock_market_data(trading_engine, instruments, duration_second
             sequence_ids[instrument] += 1
             
             # Determine what type of market data to send
-            data_type = random.choices(
-                [MarketDataType.QUOTE, MarketDataType.ORDERBOOK, MarketDataType.TRADE],
-                weights=[0.5, 0.3, 0.2],  # 50% quotes, 30% orderbook, 20% trades
-                k=1
-            )[0]
+            # (50% quotes, 30% orderbook, 20% trades)
+            data_type = draws.data_type[i]
             
             # Create market data
-            timestamp = datetime.utcnow()
+            timestamp_ns = time_ns()
             
-            if data_type == MarketDataType.QUOTE:
+            if data_type == 0:
                 # Generate quote data
-                bid = new_price * (1 - random.uniform(0.0001, 0.001))  # 1-10 bps spread
-                ask = new_price * (1 + random.uniform(0.0001, 0.001))
+                bid = new_price * (1 - draws.bid_spread[i])
+                ask = new_price * (1 + draws.ask_spread[i])
                 
+                # Positional in field order: instrument_id, timestamp_ns, data_type,
+                # exchange, data, source, sequence_id
                 market_data = MarketData(
-                    instrument_id=instrument,
-                    timestamp=timestamp,
-                    data_type=MarketDataType.QUOTE,
-                    exchange="mock_exchange",
-                    data={"bid": bid, "ask": ask, "bid_size": random.uniform(0.1, 10), "ask_size": random.uniform(0.1, 10)},
-                    source="mock_data_generator",
-                    sequence_id=sequence_ids[instrument]
+                    instrument,
+                    timestamp_ns,
+                    QUOTE,
+                    "mock_exchange",
+                    {"bid": bid, "ask": ask, "bid_size": draws.bid_size[i], "ask_size": draws.ask_size[i]},
+                    "mock_data_generator",
+                    sequence_ids[instrument]
                 )
             
-            elif data_type == MarketDataType.ORDERBOOK:
+            elif data_type == 1:
                 # Generate orderbook data
                 mid_price = new_price
                 
-                # Create bids (sorted descending by price)
-                bid_count = random.randint(5, 15)
-                bids = []
-                for i in range(bid_count):
-                    price_delta_pct = random.uniform(0.0001, 0.005) * (i + 1)  # Increase spread for deeper levels
-                    bid_price = mid_price * (1 - price_delta_pct)
-                    bid_size = random.uniform(0.1, 20) * (1 / (i + 1))  # More liquidity at better prices
-                    bids.append({"price": bid_price, "size": bid_size})
-                
-                # Create asks (sorted ascending by price)
-                ask_count = random.randint(5, 15)
-                asks = []
-                for i in range(ask_count):
-                    price_delta_pct = random.uniform(0.0001, 0.005) * (i + 1)
-                    ask_price = mid_price * (1 + price_delta_pct)
-                    ask_size = random.uniform(0.1, 20) * (1 / (i + 1))
-                    asks.append({"price": ask_price, "size": ask_size})
+                # Increase spread and reduce liquidity for deeper levels
+                bid_count = draws.bid_count[i]
+                ask_count = draws.ask_count[i]
+                if NUMBA_AVAILABLE:
+                    bid_px, bid_sz = _book_side_kernel(
+                        mid_price, draws.bid_level_delta[i, :bid_count], draws.bid_level_size[i, :bid_count], -1.0
+                    )
+                    ask_px, ask_sz = _book_side_kernel(
+                        mid_price, draws.ask_level_delta[i, :ask_count], draws.ask_level_size[i, :ask_count], 1.0
+                    )
+                else:
+                    # Without compilation a few whole-array operations beat the kernel's loops
+                    bid_px = mid_price * (1 - draws.bid_level_delta[i, :bid_count] * _LEVEL_DEPTH[:bid_count])
+                    bid_sz = draws.bid_level_size[i, :bid_count] * _LEVEL_SIZE_SCALE[:bid_count]
+                    ask_px = mid_price * (1 + draws.ask_level_delta[i, :ask_count] * _LEVEL_DEPTH[:ask_count])
+                    ask_sz = draws.ask_level_size[i, :ask_count] * _LEVEL_SIZE_SCALE[:ask_count]
+                    
+                    # Sort bids descending and asks ascending by price
+                    bid_order = np.argsort(-bid_px, kind="stable")
+                    ask_order = np.argsort(ask_px, kind="stable")
+                    bid_px, bid_sz = bid_px[bid_order], bid_sz[bid_order]
+                    ask_px, ask_sz = ask_px[ask_order], ask_sz[ask_order]
                 
                 # Create an orderbook object
                 orderbook = OrderBook(
                     instrument_id=instrument,
-                    timestamp=timestamp,
+                    timestamp_ns=timestamp_ns,
                     exchange="mock_exchange",
-                    bids=bids,
-                    asks=asks
+                    bid_px=bid_px,
+                    bid_sz=bid_sz,
+                    ask_px=ask_px,
+                    ask_sz=ask_sz
                 )
                 
                 # Convert to market data
@@ -123,32 +264,55 @@ async def generate_mock_market_data(trading_engine, instruments, duration_second
                 market_data.sequence_id = sequence_ids[instrument]
                 market_data.source = "mock_data_generator"
             
-            else:  # MarketDataType.TRADE
+            else:  # Trade
                 # Generate trade data
-                trade_price = new_price * (1 + random.normalvariate(0, 0.0002))  # Slight noise
-                trade_size = random.uniform(0.01, 5)
-                side = random.choice([OrderSide.BUY, OrderSide.SELL])
+                trade_price = new_price * (1 + draws.trade_noise[i])
+                side = BUY if draws.trade_is_buy[i] else SELL
+                trade_count = trade_counts[instrument] + 1
+                trade_counts[instrument] = trade_count
                 
+                # Positional in field order, as for quotes
                 market_data = MarketData(
-                    instrument_id=instrument,
-                    timestamp=timestamp,
-                    data_type=MarketDataType.TRADE,
-                    exchange="mock_exchange",
-                    data={
+                    instrument,
+                    timestamp_ns,
+                    TRADE,
+                    "mock_exchange",
+                    {
                         "price": trade_price,
-                        "size": trade_size,
+                        "size": draws.trade_size[i],
                         "side": side.name,
-                        "trade_id": f"mock_trade_{instrument}_{int(time.time() * 1000)}_{random.randint(1000, 9999)}"
+                        "trade_id": trade_id_prefixes[instrument] + str(trade_count)
                     },
-                    source="mock_data_generator",
-                    sequence_id=sequence_ids[instrument]
+                    "mock_data_generator",
+                    sequence_ids[instrument]
                 )
             
-            # Send the market data to the trading engine
-            await trading_engine.process_market_data(market_data)
+            sleep_seconds = draws.sleep_seconds[i]
+            i += 1
             
-            # Sleep a random amount of time
-            await asyncio.sleep(random.uniform(0.001, 0.05))
+            # Send the market data to the trading engine once a batch is ready
+            batch.append(market_data)
+            if len(batch) < MARKET_DATA_BATCH_SIZE and monotonic() < flush_deadline:
+                continue
+            
+            # Wait for the engine to work through its backlog before adding to it
+            while event_queue_size() > MARKET_DATA_MAX_BACKLOG and trading_engine.running:
+                await asyncio.sleep(MARKET_DATA_FLUSH_SECONDS)
+            await process_batch(batch)
+            batch.clear()
+            
+            # Sleep a random amount of time between batches, measured from the previous
+            # wake-up so the time spent generating doesn't stretch the cadence
+            next_wake += sleep_seconds
+            now = monotonic()
+            if next_wake < now:
+                next_wake = now  # Fell behind; resume from now rather than catch up in a burst
+            await asyncio.sleep(next_wake - now)
+            flush_deadline = monotonic() + MARKET_DATA_FLUSH_SECONDS
+        
+        # Send whatever is left of the last batch
+        if batch:
+            await process_batch(batch)
     
     except asyncio.CancelledError:
         logger.info("Mock market data generator cancelled")
@@ -159,255 +323,283 @@ async def generate_mock_market_data(trading_engine, instruments, duration_second
     logger.info("Mock market data generator finished")
 
 
-async def generate_mock_orders(trading_engine, instruments, duration_seconds=300):
-    """Generate mock orders for testing"""
-    logger.info("Starting mock order generator")
-    
-    # Register a mock strategy
-    await trading_engine.register_strategy("mock_strategy", {
-        "name": "Mock Strategy",
-        "description": "A strategy that randomly generates orders for testing",
-        "author": "System",
-        "version": "1.0.0",
-        "parameters": {}
-    })
-    
-    # Generate orders for the specified duration
-    end_time = datetime.utcnow() + timedelta(seconds=duration_seconds)
-    orders_placed = 0
+async def _order_callback(updated_order):
+    """Order status callback shared by every mock order"""
+    logger.debug("Order callback for %s: %s", updated_order.order_id, updated_order.status)
+
+
+class _MockOrderFlow:
+    """
+    Mock order placement, cancellation and fills, run one step at a time by the scheduler
+    Each step returns the delay in seconds until it should run again, or None when done
+    """
     
-    try:
-        # Wait a bit for market data to start flowing
-        await asyncio.sleep(2)
+    def __init__(self, trading_engine, instruments, schedule):
+        self.trading_engine = trading_engine
+        self.instruments = instruments
+        self.schedule = schedule  # schedule(delay_seconds, job) queues a one-off job
+        # Positions are updated in place, so each instrument's handle is looked up once
+        self.positions = {instrument: trading_engine.get_position(instrument) for instrument in instruments}
+        self.orders_placed = 0
+        self.fills_generated = 0
+    
+    async def register_strategy(self):
+        """Register the mock strategy the orders are placed under"""
+        await self.trading_engine.register_strategy("mock_strategy", {
+            "name": "Mock Strategy",
+            "description": "A strategy that randomly generates orders for testing",
+            "author": "System",
+            "version": "1.0.0",
+            "parameters": {}
+        })
+    
+    async def place_order(self) -> Optional[float]:
+        """Place one random order"""
+        trading_engine = self.trading_engine
         
-        while datetime.utcnow() < end_time and trading_engine.running:
-            # Select a random instrument
-            instrument = random.choice(instruments)
-            
-            # Get current position
-            position = trading_engine.get_position(instrument)
-            
-            # Decide order side (tend toward mean reversion)
-            if position.quantity > 0:
-                # More likely to sell when long
-                side = random.choices(
-                    [OrderSide.BUY, OrderSide.SELL],
-                    weights=[0.3, 0.7],
-                    k=1
-                )[0]
-            elif position.quantity < 0:
-                # More likely to buy when short
-                side = random.choices(
-                    [OrderSide.BUY, OrderSide.SELL],
-                    weights=[0.7, 0.3],
-                    k=1
-                )[0]
+        # Select a random instrument
+        instrument = random.choice(self.instruments)
+        
+        # Get current position
+        position = self.positions[instrument]
+        
+        # Decide order side (tend toward mean reversion)
+        if position.quantity > 0:
+            # More likely to sell when long
+            side = OrderSide.SELL if random.random() < 0.7 else OrderSide.BUY
+        elif position.quantity < 0:
+            # More likely to buy when short
+            side = OrderSide.BUY if random.random() < 0.7 else OrderSide.SELL
+        else:
+            # Equal chance when flat
+            side = OrderSide.BUY if random.random() < 0.5 else OrderSide.SELL
+        
+        # Decide order type (70% limit orders)
+        order_type = OrderType.MARKET if random.random() < 0.3 else OrderType.LIMIT
+        
+        # Determine quantity
+        base_quantity = random.uniform(0.1, 1.0 if "BTC" in instrument else 5.0 if "ETH" in instrument else 100.0)
+        
+        # Create order
+        order = Order(
+            instrument_id=instrument,
+            order_type=order_type,
+            side=side,
+            quantity=base_quantity,
+            time_in_force=TimeInForce.GTC,
+            exchange="mock_exchange",
+            strategy_id="mock_strategy"
+        )
+        
+        # For limit orders, set a price
+        if order_type == OrderType.LIMIT:
+            # Get current price from position
+            current_price = position.current_price
+            if current_price is None:
+                # Skip if we don't have a price yet
+                return random.uniform(0.1, 0.5)
+            
+            # Set limit price a bit away from current price
+            if side == OrderSide.BUY:
+                # Buy slightly below current price
+                order.price = current_price * (1 - random.uniform(0.001, 0.01))
             else:
-                # Equal chance when flat
-                side = random.choice([OrderSide.BUY, OrderSide.SELL])
-            
-            # Decide order type
-            order_type = random.choices(
-                [OrderType.MARKET, OrderType.LIMIT],
-                weights=[0.3, 0.7],  # 70% limit orders
-                k=1
-            )[0]
-            
-            # Determine quantity
-            base_quantity = random.uniform(0.1, 1.0 if "BTC" in instrument else 5.0 if "ETH" in instrument else 100.0)
-            
-            # Create order
-            order = Order(
-                instrument_id=instrument,
-                order_type=order_type,
-                side=side,
-                quantity=base_quantity,
-                time_in_force=TimeInForce.GTC,
-                exchange="mock_exchange",
-                strategy_id="mock_strategy"
+                # Sell slightly above current price
+                order.price = current_price * (1 + random.uniform(0.001, 0.01))
+        
+        # Wait a random amount of time between orders
+        delay = random.uniform(0.5, 3.0)
+        
+        # Submit the order
+        try:
+            order_id = await trading_engine.submit_order(order, _order_callback)
+            self.orders_placed += 1
+            logger.info(
+                "Placed %s %s order for %s %s with ID %s",
+                order.order_type.name, order.side.name, order.quantity, instrument, order_id
             )
             
-            # For limit orders, set a price
-            if order_type == OrderType.LIMIT:
-                # Get current price from position
-                current_price = position.current_price
-                if current_price is None:
-                    # Skip if we don't have a price yet
-                    await asyncio.sleep(random.uniform(0.1, 0.5))
-                    continue
-                
-                # Set limit price a bit away from current price
-                if side == OrderSide.BUY:
-                    # Buy slightly below current price
-                    order.price = current_price * (1 - random.uniform(0.001, 0.01))
-                else:
-                    # Sell slightly above current price
-                    order.price = current_price * (1 + random.uniform(0.001, 0.01))
-            
-            # Submit the order
-            async def order_callback(updated_order):
-                logger.debug(f"Order callback for {updated_order.order_id}: {updated_order.status}")
-            
-            try:
-                order_id = await trading_engine.submit_order(order, order_callback)
-                orders_placed += 1
-                logger.info(f"Placed {order.order_type.name} {order.side.name} order for {order.quantity} {instrument} with ID {order_id}")
-                
-                # Randomly cancel some orders
-                if order_type == OrderType.LIMIT and random.random() < 0.3:  # 30% chance to cancel
-                    # Wait a bit before cancelling
-                    await asyncio.sleep(random.uniform(0.5, 2.0))
-                    cancel_result = await trading_engine.cancel_order(order_id)
-                    if cancel_result:
-                        logger.info(f"Cancelled order {order_id}")
-            except Exception as e:
-                logger.error(f"Error placing order: {e}")
-            
-            # Sleep a random amount of time between orders
-            await asyncio.sleep(random.uniform(0.5, 3.0))
-    
-    except asyncio.CancelledError:
-        logger.info("Mock order generator cancelled")
-        raise
-    except Exception as e:
-        logger.exception(f"Error in mock order generator: {e}")
-    
-    logger.info(f"Mock order generator finished. Placed {orders_placed} orders")
-
-
-async def simulate_order_fills(trading_engine, duration_seconds=300):
-    """Simulate order fills for the mock orders"""
-    logger.info("Starting order fill simulator")
+            # Randomly cancel some orders
+            if order_type == OrderType.LIMIT and random.random() < 0.3:  # 30% chance to cancel
+                # Wait a bit before cancelling, and hold off the next order until then
+                cancel_delay = random.uniform(0.5, 2.0)
+                self.schedule(cancel_delay, functools.partial(self.cancel_order, order_id))
+                delay += cancel_delay
+        except Exception as e:
+            logger.error("Error placing order: %s", e)
+        
+        return delay
     
-    # Generate fills for the specified duration
-    end_time = datetime.utcnow() + timedelta(seconds=duration_seconds)
-    fills_generated = 0
+    async def cancel_order(self, order_id: str) -> Optional[float]:
+        """Cancel an order placed earlier"""
+        try:
+            cancel_result = await self.trading_engine.cancel_order(order_id)
+            if cancel_result:
+                logger.info("Cancelled order %s", order_id)
+        except Exception as e:
+            logger.error("Error cancelling order: %s", e)
+        return None
     
-    try:
-        # Wait a bit for orders to start flowing
-        await asyncio.sleep(5)
+    async def fill_order(self) -> Optional[float]:
+        """Simulate a fill for a random active order"""
+        trading_engine = self.trading_engine
         
-        while datetime.utcnow() < end_time and trading_engine.running:
-            # Get all active orders
-            active_orders = trading_engine.order_manager.get_active_orders()
-            
-            if not active_orders:
-                await asyncio.sleep(0.5)
-                continue
-            
-            # Select a random order to fill
-            order = random.choice(active_orders)
-            
-            # Determine how much to fill
-            remaining_qty = order.quantity - order.filled_quantity
-            if remaining_qty <= 0:
-                continue
-                
-            fill_pct = random.choices(
-                [0.25, 0.5, 1.0],  # 25%, 50%, or 100% fill
-                weights=[0.3, 0.3, 0.4],  # 40% chance of complete fill
-                k=1
-            )[0]
-            
-            fill_qty = remaining_qty * fill_pct
-            
-            # Determine fill price
-            if order.order_type == OrderType.MARKET:
-                # Fill at current price with slight slippage
+        # Select a random active order to fill
+        order = trading_engine.order_manager.random_active_order()
+        
+        if order is None:
+            return 0.5
+        
+        # Determine how much to fill
+        remaining_qty = order.quantity - order.filled_quantity
+        if remaining_qty <= 0:
+            return 0.0
+            
+        # 25%, 50%, or 100% fill, with a 40% chance of complete fill
+        r = random.random()
+        fill_pct = 0.25 if r < 0.3 else 0.5 if r < 0.6 else 1.0
+        
+        fill_qty = remaining_qty * fill_pct
+        
+        # Determine fill price
+        if order.order_type == OrderType.MARKET:
+            # Fill at current price with slight slippage
+            position = self.positions.get(order.instrument_id)
+            if position is None:
                 position = trading_engine.get_position(order.instrument_id)
-                if position.current_price is None:
-                    continue
-                
-                base_price = position.current_price
-                slippage = random.uniform(0.0001, 0.002)  # 1-20 bps slippage
-                
-                if order.side == OrderSide.BUY:
-                    fill_price = base_price * (1 + slippage)
-                else:
-                    fill_price = base_price * (1 - slippage)
-            
-            else:  # LIMIT order
-                # Fill at the limit price or better
-                if order.price is None:
-                    continue
-                
-                if order.side == OrderSide.BUY:
-                    # Fill at or below limit price
-                    max_improvement = order.price * 0.001  # Max 10 bps price improvement
-                    fill_price = order.price - random.uniform(0, max_improvement)
-                else:
-                    # Fill at or above limit price
-                    max_improvement = order.price * 0.001
-                    fill_price = order.price + random.uniform(0, max_improvement)
-            
-            # Create a trade
-            trade = Trade(
-                order_id=order.order_id,
-                instrument_id=order.instrument_id,
-                quantity=fill_qty,
-                price=fill_price,
-                side=order.side,
-                timestamp=datetime.utcnow(),
-                exchange=order.exchange,
-                commission=fill_qty * fill_price * 0.001  # 10 bps commission
-            )
-            
-            # Submit the trade update
-            await trading_engine.event_processor.publish(Event(
-                event_type=EventType.TRADE_UPDATE,
-                data=trade,
-                source="mock_exchange"
-            ))
+            if position.current_price is None:
+                # No price to fill at yet; back off rather than spin
+                return 0.5
             
-            fills_generated += 1
-            logger.debug(f"Generated fill for order {order.order_id}: {fill_qty} @ {fill_price}")
+            base_price = position.current_price
+            slippage = random.uniform(0.0001, 0.002)  # 1-20 bps slippage
             
-            # Sleep a random amount of time between fills
-            await asyncio.sleep(random.uniform(0.1, 1.0))
+            if order.side == OrderSide.BUY:
+                fill_price = base_price * (1 + slippage)
+            else:
+                fill_price = base_price * (1 - slippage)
+        
+        else:  # LIMIT order
+            # Fill at the limit price or better
+            if order.price is None:
+                return 0.0
+            
+            if order.side == OrderSide.BUY:
+                # Fill at or below limit price
+                max_improvement = order.price * 0.001  # Max 10 bps price improvement
+                fill_price = order.price - random.uniform(0, max_improvement)
+            else:
+                # Fill at or above limit price
+                max_improvement = order.price * 0.001
+                fill_price = order.price + random.uniform(0, max_improvement)
+        
+        # Create a trade
+        trade = Trade(
+            order_id=order.order_id,
+            instrument_id=order.instrument_id,
+            quantity=fill_qty,
+            price=fill_price,
+            side=order.side,
+            exchange=order.exchange,
+            commission=fill_qty * fill_price * 0.001  # 10 bps commission
+        )
+        
+        # Submit the trade update
+        await trading_engine.event_processor.publish(Event(
+            event_type=EventType.TRADE_UPDATE,
+            data=trade,
+            source="mock_exchange"
+        ))
+        
+        self.fills_generated += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated fill for order %s: %s @ %s", order.order_id, fill_qty, fill_price)
+        
+        # Wait a random amount of time between fills
+        return random.uniform(0.1, 1.0)
+
+
+def print_trading_status(trading_engine):
+    """Print the status of the trading engine"""
+    # Get positions
+    positions = trading_engine.get_all_positions()
+    pnl_summary = trading_engine.position_manager.get_pnl_summary()
+    order_stats = trading_engine.order_manager.get_order_statistics()
     
-    except asyncio.CancelledError:
-        logger.info("Order fill simulator cancelled")
-        raise
-    except Exception as e:
-        logger.exception(f"Error in order fill simulator: {e}")
+    # Print status
+    print("\n==== Trading Engine Status ====")
+    print(f"Time: {time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime())}")
+    print(f"Active Orders: {order_stats['active_orders']} of {order_stats['total_orders']}")
     
-    logger.info(f"Order fill simulator finished. Generated {fills_generated} fills")
+    print("\n-- Positions --")
+    for pos in positions:
+        if pos.quantity != 0:
+            print(f"{pos.instrument_id}: {pos.quantity:.4f} @ {pos.average_entry_price:.2f} " +
+                  f"Current: {pos.current_price:.2f} P&L: {pos.unrealized_pnl:.2f}")
+    
+    print("\n-- P&L Summary --")
+    print(f"Realized P&L: {pnl_summary['realized_pnl']:.2f}")
+    print(f"Unrealized P&L: {pnl_summary['unrealized_pnl']:.2f}")
+    print(f"Total P&L: {pnl_summary['total_pnl']:.2f}")
+    print("==========================\n")
 
 
-async def print_trading_status(trading_engine, interval_seconds=10, duration_seconds=300):
-    """Periodically print the status of the trading engine"""
-    end_time = datetime.utcnow() + timedelta(seconds=duration_seconds)
+async def run_mock_scheduler(trading_engine, instruments, duration_seconds=300, status_interval_seconds=10):
+    """
+    Run the mock order generator, fill simulator and status printer from one task
+    Jobs wait in a heap keyed by their monotonic due time, so the task only
+    wakes when the earliest job is due
+    """
+    logger.info("Starting mock order scheduler")
+    
+    heap: List[Tuple[float, int, Callable[[], Awaitable[Optional[float]]]]] = []
+    sequence = itertools.count()  # Breaks ties between jobs due at the same time
+    
+    def schedule(delay_seconds, job):
+        heapq.heappush(heap, (time.monotonic() + delay_seconds, next(sequence), job))
+    
+    async def print_status():
+        print_trading_status(trading_engine)
+        return status_interval_seconds
+    
+    flow = _MockOrderFlow(trading_engine, instruments, schedule)
+    await flow.register_strategy()
+    
+    schedule(2, flow.place_order)  # Wait a bit for market data to start flowing
+    schedule(5, flow.fill_order)  # Wait a bit for orders to start flowing
+    schedule(0, print_status)
+    
+    end_time = time.monotonic() + duration_seconds
     
     try:
-        while datetime.utcnow() < end_time and trading_engine.running:
-            # Get positions
-            positions = trading_engine.get_all_positions()
-            pnl_summary = trading_engine.position_manager.get_pnl_summary()
-            order_stats = trading_engine.order_manager.get_order_statistics()
+        while heap and trading_engine.running:
+            due, _, job = heapq.heappop(heap)
+            if due >= end_time:
+                break
             
-            # Print status
-            print("\n==== Trading Engine Status ====")
-            print(f"Time: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"Active Orders: {order_stats['active_orders']} of {order_stats['total_orders']}")
+            # Sleep until the job is due; a zero sleep still yields to the loop
+            await asyncio.sleep(max(0.0, due - time.monotonic()))
+            if not trading_engine.running:
+                break
             
-            print("\n-- Positions --")
-            for pos in positions:
-                if pos.quantity != 0:
-                    print(f"{pos.instrument_id}: {pos.quantity:.4f} @ {pos.average_entry_price:.2f} " +
-                          f"Current: {pos.current_price:.2f} P&L: {pos.unrealized_pnl:.2f}")
-            
-            print("\n-- P&L Summary --")
-            print(f"Realized P&L: {pnl_summary['realized_pnl']:.2f}")
-            print(f"Unrealized P&L: {pnl_summary['unrealized_pnl']:.2f}")
-            print(f"Total P&L: {pnl_summary['total_pnl']:.2f}")
-            print("==========================\n")
+            try:
+                delay = await job()
+            except Exception as e:
+                # Drop the failing job, the others keep running
+                logger.exception(f"Error in mock scheduler job: {e}")
+                continue
             
-            await asyncio.sleep(interval_seconds)
+            if delay is not None:
+                schedule(delay, job)
     
     except asyncio.CancelledError:
-        pass
-    except Exception as e:
-        logger.exception(f"Error in status printer: {e}")
+        logger.info("Mock order scheduler cancelled")
+        raise
+    
+    logger.info(
+        f"Mock order scheduler finished. Placed {flow.orders_placed} orders, "
+        f"generated {flow.fills_generated} fills"
+    )
 
 
 async def main():
@@ -436,12 +628,11 @@ async def main():
         # Run simulations for 5 minutes
         simulation_duration = 300
         
-        # Create tasks
+        # Market data streams from its own task; orders, fills and status
+        # printing share one scheduler task
         tasks = [
             asyncio.create_task(generate_mock_market_data(trading_engine, test_instruments, simulation_duration)),
-            asyncio.create_task(generate_mock_orders(trading_engine, test_instruments, simulation_duration)),
-            asyncio.create_task(simulate_order_fills(trading_engine, simulation_duration)),
-            asyncio.create_task(print_trading_status(trading_engine, 10, simulation_duration))
+            asyncio.create_task(run_mock_scheduler(trading_engine, test_instruments, simulation_duration, 10))
         ]
         
         # Wait for all tasks to complete
@@ -459,13 +650,25 @@ async def main():
 
 
 if __name__ == "__main__":
-    import time
+    # Console logging until the engine applies its configured level, format and file
+    configure_logging(log_format="text")
     time.sleep(1)  # Small delay to let logging initialize
     
     try:
-        asyncio.run(main())
+        # uvloop is a drop-in, faster event loop; use it when it is installed
+        if uvloop is None:
+            asyncio.run(main())
+        elif hasattr(uvloop, "run"):
+            uvloop.run(main())
+        else:
+            # uvloop releases before 0.18 have no run()
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("Keyboard interrupt received, exiting...")
     except Exception as e:
         logger.critical(f"Fatal error: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        # Write out whatever the listener thread still has queued
+        shutdown_logging()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the engine package the same way main.py does, from this directory
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
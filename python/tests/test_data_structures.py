@@ -0,0 +1,42 @@
+import pytest
+
+from engine.data_structures import OrderSide, Position, Trade
+
+
+def _fill(position: Position, side: OrderSide, quantity: float, price: float):
+    position.apply_trade(Trade(
+        order_id="order-1",
+        instrument_id=position.instrument_id,
+        quantity=quantity,
+        price=price,
+        side=side
+    ))
+
+
+def test_reducing_a_long_keeps_its_average_entry_price():
+    position = Position(instrument_id="BTC-USD")
+    _fill(position, OrderSide.BUY, 2, 10.0)
+    _fill(position, OrderSide.SELL, 1, 12.0)
+    
+    assert position.quantity == 1
+    assert position.average_entry_price == pytest.approx(10.0)
+    assert position.realized_pnl == pytest.approx(2.0)
+    assert position.unrealized_pnl == pytest.approx(2.0)
+
+
+def test_short_is_marked_to_market_with_the_right_sign():
+    position = Position(instrument_id="BTC-USD")
+    _fill(position, OrderSide.SELL, 2, 10.0)
+    
+    position.update_price(8.0)
+    assert position.unrealized_pnl == pytest.approx(4.0)
+    assert position.position_value == pytest.approx(-16.0)
+    
+    position.update_price(11.0)
+    assert position.unrealized_pnl == pytest.approx(-2.0)
+    
+    # A partial cover marks the remainder at the fill price
+    _fill(position, OrderSide.BUY, 1, 9.0)
+    assert position.average_entry_price == pytest.approx(10.0)
+    assert position.realized_pnl == pytest.approx(1.0)
+    assert position.unrealized_pnl == pytest.approx(1.0)
@@ -0,0 +1,38 @@
+import asyncio
+
+from engine.data_structures import EventType, Order, OrderStatus
+from engine.event_processor import EventProcessor
+from engine.order_manager import OrderManager
+
+
+def _collect(events):
+    async def handler(event):
+        events.append(event)
+    return handler
+
+
+def test_batch_cancel_waits_for_room_instead_of_dropping():
+    async def run():
+        event_processor = EventProcessor(max_queue_size=2)
+        order_manager = OrderManager(event_processor)
+        delivered = []
+        event_processor.add_handler(EventType.ORDER_UPDATE, _collect(delivered))
+        processor_task = asyncio.create_task(event_processor.start())
+        
+        order_ids = []
+        for _ in range(5):
+            order = Order(instrument_id="BTC-USD", quantity=1, price=100.0)
+            order_ids.append(await order_manager.submit_order(order))
+            order.status = OrderStatus.NEW
+        
+        results = await order_manager.batch_cancel_orders(order_ids + ["unknown"])
+        await asyncio.sleep(0.05)
+        await event_processor.stop()
+        await processor_task
+        
+        assert results == {**{order_id: True for order_id in order_ids}, "unknown": False}
+        # One submit and one cancel event per order
+        assert len(delivered) == 10
+        assert event_processor.dropped_events_count == 0
+    
+    asyncio.run(run())
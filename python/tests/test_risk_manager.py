@@ -0,0 +1,40 @@
+import asyncio
+import gc
+import warnings
+
+import pytest
+
+from engine.event_processor import EventProcessor
+from engine.order_manager import OrderManager
+from engine.position_manager import PositionManager
+from engine.risk_manager import RiskManager, RiskRule
+
+
+class _AsyncRule(RiskRule):
+    __slots__ = ()
+    
+    async def check(self, risk_manager, context):
+        return True, "Rule passed"
+
+
+class _BrokenRule(RiskRule):
+    __slots__ = ()
+    
+    def check_sync(self, risk_manager, context):
+        raise RuntimeError("bug in rule")
+
+
+def test_inline_rule_error_leaves_no_unawaited_coroutines():
+    async def run():
+        event_processor = EventProcessor()
+        order_manager = OrderManager(event_processor)
+        risk_manager = RiskManager(event_processor, order_manager, PositionManager(event_processor))
+        rules = [("async", _AsyncRule("async")), ("broken", _BrokenRule("broken"))]
+        with pytest.raises(RuntimeError):
+            await risk_manager._run_rules(rules, {"event_type": "periodic"})
+    
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        asyncio.run(run())
+        gc.collect()
+    assert not [w for w in caught if "never awaited" in str(w.message)]
@@ -0,0 +1,108 @@
+import asyncio
+import os
+
+import yaml
+
+import pytest
+
+from engine.trading_engine import TradingEngine, _read_config
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+
+def _make_engine(tmp_path, **config) -> TradingEngine:
+    config_path = tmp_path / "trading_config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "engine_name": "TestEngine",
+        "instance_id": "test",
+        "log_level": "WARNING",
+        **config
+    }))
+    return TradingEngine(str(config_path))
+
+
+def test_heartbeats_reach_the_ring_while_running(tmp_path):
+    async def run():
+        engine = _make_engine(
+            tmp_path,
+            heartbeat_interval_seconds=0.01,
+            telemetry={"heartbeat_ring": {"enabled": True, "slots": 16}}
+        )
+        await asyncio.wait_for(engine.start(), timeout=5)
+        try:
+            await asyncio.sleep(0.1)
+            assert engine.running
+            assert engine.heartbeat_ring.count > 0
+        finally:
+            await engine.stop()
+    
+    asyncio.run(run())
+
+
+def test_position_snapshot_is_written_while_running(tmp_path):
+    snapshot_path = tmp_path / "positions_snapshot.json"
+    
+    async def run():
+        engine = _make_engine(
+            tmp_path,
+            data_storage={"position_snapshots": {
+                "enabled": True,
+                "path": str(snapshot_path),
+                "interval_seconds": 0.01
+            }}
+        )
+        await asyncio.wait_for(engine.start(), timeout=5)
+        try:
+            await asyncio.sleep(0.2)
+            assert engine.running
+            assert os.path.exists(snapshot_path)
+        finally:
+            await engine.stop()
+    
+    asyncio.run(run())
+
+
+def test_config_cache_ignores_a_restored_older_file(tmp_path):
+    config_path = tmp_path / "trading_config.yaml"
+    config_path.write_text("risk_limits:\n  max_drawdown_pct: 5\n")
+    os.utime(config_path, ns=(2_000_000_000_000_000_000, 2_000_000_000_000_000_000))
+    assert _read_config(str(config_path)) == {"risk_limits": {"max_drawdown_pct": 5}}
+    
+    # Replace the file with different settings carrying an older mtime, as a checkout or rsync -t would
+    config_path.write_text("risk_limits:\n  max_drawdown_pct: 7\n")
+    os.utime(config_path, ns=(1_000_000_000_000_000_000, 1_000_000_000_000_000_000))
+    assert _read_config(str(config_path)) == {"risk_limits": {"max_drawdown_pct": 7}}
+    
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_heartbeats_continue_when_snapshots_fail(tmp_path):
+    async def run():
+        engine = _make_engine(
+            tmp_path,
+            heartbeat_interval_seconds=0.01,
+            telemetry={"heartbeat_ring": {"enabled": True, "slots": 64}},
+            data_storage={"position_snapshots": {
+                "enabled": True,
+                "path": str(tmp_path / "positions_snapshot.json"),
+                "interval_seconds": 0.01
+            }}
+        )
+        
+        def broken_snapshot():
+            raise TypeError("unserializable position")
+        
+        engine.position_manager.materialize_snapshot = broken_snapshot
+        await asyncio.wait_for(engine.start(), timeout=5)
+        try:
+            await asyncio.sleep(0.05)
+            count = engine.heartbeat_ring.count
+            await asyncio.sleep(0.1)
+            assert engine.heartbeat_ring.count > count
+        finally:
+            await engine.stop()
+    
+    asyncio.run(run())
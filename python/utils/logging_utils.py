@@ -1,10 +1,44 @@
+import copy
+import functools
 import logging
 import os
 import sys
-from datetime import datetime
+import time
 import json
+import types
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# LogRecord attributes that are not copied into the JSON output as custom fields
+_EXCLUDED_RECORD_KEYS = frozenset({
+    "args", "asctime", "created", "exc_info", "exc_text", "filename",
+    "funcName", "id", "levelname", "levelno", "lineno", "module",
+    "msecs", "message", "msg", "name", "pathname", "process",
+    "processName", "relativeCreated", "stack_info", "thread", "threadName"
+})
+
+# Listener thread that formats and writes records queued by configure_logging
+_listener: Optional["logging.handlers.QueueListener"] = None
+_queue_handler: Optional[logging.Handler] = None  # Root logger handler feeding _listener
+
+# Last formatted local-time second, reused by records created within the same second
+_timestamp_cache = [-1, ""]
+
+
+def _format_timestamp(created: float) -> str:
+    """Format a record's creation time as a local ISO timestamp with microseconds"""
+    sec = int(created)
+    if sec != _timestamp_cache[0]:
+        _timestamp_cache[0] = sec
+        _timestamp_cache[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+    usec = min(round((created - sec) * 1_000_000), 999_999)
+    return f"{_timestamp_cache[1]}.{usec:06d}"
+
 
 class JSONFormatter(logging.Formatter):
     """Format log records as JSON for easier parsing and analysis"""
@@ -12,7 +46,7 @@ class JSONFormatter(logging.Formatter):
     def format(self, record: logging.LogRecord) -> str:
         """Format the log record as JSON"""
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": _format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -31,19 +65,40 @@ class JSONFormatter(logging.Formatter):
         
         # Add custom fields from LogRecord
         for key, value in record.__dict__.items():
-            if key not in {
-                "args", "asctime", "created", "exc_info", "exc_text", "filename",
-                "funcName", "id", "levelname", "levelno", "lineno", "module",
-                "msecs", "message", "msg", "name", "pathname", "process",
-                "processName", "relativeCreated", "stack_info", "thread", "threadName"
-            }:
-                try:
-                    json.dumps({key: value})  # Check if serializable
-                    log_data[key] = value
-                except (TypeError, OverflowError):
-                    log_data[key] = str(value)
+            if key not in _EXCLUDED_RECORD_KEYS:
+                log_data[key] = value
+        
+        # Values that aren't JSON serializable are written as their str()
+        if orjson is not None:
+            try:
+                return orjson.dumps(log_data, default=str).decode()
+            except TypeError:
+                pass  # e.g. integers wider than 64 bits or non-string keys
+        try:
+            return json.dumps(log_data, default=str)
+        except (TypeError, ValueError, OverflowError):
+            return json.dumps({key: str(value) for key, value in log_data.items()})
+
+
+@functools.lru_cache(maxsize=1)
+def _local_queue_handler_class():
+    """
+    Build the queue handler class on first use, so that importing this module
+    does not pull in logging.handlers
+    """
+    from logging.handlers import QueueHandler
+    
+    class _LocalQueueHandler(QueueHandler):
+        """Queue handler for an in-process listener; records keep their exception info"""
         
-        return json.dumps(log_data)
+        def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+            """Merge the message arguments now and leave formatting to the listener"""
+            record = copy.copy(record)
+            record.msg = record.getMessage()
+            record.args = None
+            return record
+    
+    return _LocalQueueHandler
 
 
 def configure_logging(
@@ -58,10 +113,14 @@ def configure_logging(
     
     Args:
         log_level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
-        log_format: Format of log messages (json or text)
+        log_format: Format of log messages: json, text, or a %-style format string
         log_file: Path to log file
         log_to_console: Whether to log to console
         log_to_file: Whether to log to file
+    
+    Records are only queued by the logging call; a listener thread formats
+    them and writes them to the console and file handlers. Call
+    shutdown_logging() on exit to flush what is still queued.
     """
     # Convert log level string to logging level
     numeric_level = getattr(logging, log_level.upper(), None)
@@ -79,29 +138,46 @@ def configure_logging(
     root_logger.setLevel(numeric_level)
     
     # Remove existing handlers
+    shutdown_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
     # Create formatter based on format type
     if log_format.lower() == "json":
         formatter = JSONFormatter()
-    else:
+    elif log_format.lower() == "text":
         formatter = logging.Formatter(
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
+    else:
+        formatter = logging.Formatter(log_format)
+    
+    handlers = []
     
     # Add console handler if requested
     if log_to_console:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
     
     # Add file handler if requested
     if log_to_file and log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    # Hand records to a listener thread so formatting and I/O stay off the caller
+    if handlers:
+        from logging.handlers import QueueListener
+        import queue
+        
+        global _listener, _queue_handler
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        _queue_handler = _local_queue_handler_class()(log_queue)
+        root_logger.addHandler(_queue_handler)
     
     # Set specific levels for noisy modules
     logging.getLogger("asyncio").setLevel(logging.WARNING)
@@ -109,19 +185,34 @@ def configure_logging(
     logging.getLogger("aiohttp").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Stop the listener started by configure_logging, writing any records still queued"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler = None
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+
 class LoggerAdapter(logging.LoggerAdapter):
     """Adapter that adds context to log messages"""
     
     def __init__(self, logger, extra=None):
-        super().__init__(logger, extra or {})
+        super().__init__(logger, extra if extra is not None else {})
     
     def process(self, msg, kwargs):
         """Process the log message and add context"""
-        extra = kwargs.get("extra", {})
-        for key, value in self.extra.items():
-            if key not in extra:
-                extra[key] = value
-        kwargs["extra"] = extra
+        extra = kwargs.get("extra")
+        if extra is None:
+            # The record copies the context out, so the adapter's dict can be passed as is
+            kwargs["extra"] = self.extra
+        else:
+            # Context fills in whatever the caller didn't set
+            kwargs["extra"] = {**self.extra, **extra}
         return msg, kwargs
     
     def with_context(self, **kwargs) -> 'LoggerAdapter':
@@ -139,7 +230,18 @@ def get_logger(name: str, **context) -> LoggerAdapter:
         **context: Additional context to include with all log messages
     
     Returns:
-        LoggerAdapter: Logger adapter with context
+        LoggerAdapter: Logger adapter with context; repeated calls with the same
+        name and hashable context return the same adapter, whose context is
+        read-only so that no caller can change it for the others
     """
-    logger = logging.getLogger(name)
-    return LoggerAdapter(logger, context)
\ No newline at end of file
+    try:
+        return _get_cached_logger(name, frozenset(context.items()))
+    except TypeError:
+        # Unhashable context values can't be cached
+        return LoggerAdapter(logging.getLogger(name), context)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_cached_logger(name: str, context: frozenset) -> LoggerAdapter:
+    """Build the adapter for get_logger, once per (name, context)"""
+    return LoggerAdapter(logging.getLogger(name), types.MappingProxyType(dict(context)))
\ No newline at end of file